@@ -33,6 +33,8 @@ class QUICTransportKwargs(TypedDict, total=False):
     max_concurrent_streams: int
     connection_window: int
     stream_window: int
+    socket_receive_buffer: int | None
+    socket_send_buffer: int | None
 
     # Logging and debugging
     enable_qlog: bool
@@ -72,6 +74,8 @@ class QUICTransportConfig(ConnectionConfig):
     max_concurrent_streams: int = 100  # Maximum concurrent streams per connection
     connection_window: int = 1024 * 1024  # Connection flow control window
     stream_window: int = 64 * 1024  # Stream flow control window
+    socket_receive_buffer: int | None = 4 * 1024 * 1024  # Listener SO_RCVBUF
+    socket_send_buffer: int | None = 4 * 1024 * 1024  # Listener SO_SNDBUF
 
     # Logging and debugging
     enable_qlog: bool = False  # Enable QUIC logging
@@ -197,6 +201,11 @@ class QUICTransportConfig(ConnectionConfig):
         if self.max_datagram_size < 1200:
             raise ValueError("Max datagram size must be at least 1200 bytes")
 
+        for buffer_field in ("socket_receive_buffer", "socket_send_buffer"):
+            buffer_size = getattr(self, buffer_field)
+            if buffer_size is not None and buffer_size <= 0:
+                raise ValueError(f"{buffer_field} must be positive")
+
         # Validate timeouts
         timeout_fields = [
             "STREAM_OPEN_TIMEOUT",
@@ -11,7 +11,7 @@ import time
 from typing import TYPE_CHECKING, Any, Optional
 
 from aioquic.quic import events
-from aioquic.quic.connection import QuicConnection
+from aioquic.quic.connection import QuicConnection, QuicConnectionError
 from aioquic.quic.events import QuicEvent
 from cryptography import x509
 import multiaddr
@@ -33,6 +33,7 @@ from .exceptions import (
     QUICStreamTimeoutError,
 )
 from .stream import QUICStream, StreamDirection
+from .udp import DatagramReceiver, send_datagrams
 
 if TYPE_CHECKING:
     from .security import QUICTLSConfigManager
@@ -464,21 +465,32 @@ class QUICConnection(IRawConnection, IMuxedConn):
         logger.debug("Starting client packet receiver")
         logger.debug("Started QUIC client packet receiver")
 
+        if not self._socket:
+            return
+        # A dialed socket carries a single connection's traffic, so one reused
+        # buffer is enough; the batched ring is kept for the listener
+        receiver = DatagramReceiver(self._socket, batch_size=1)
+
         try:
             while not self._closed and self._socket:
                 try:
-                    # Receive UDP packets
-                    data, addr = await self._socket.recvfrom(65536)
-                    logger.debug(f"Client received {len(data)} bytes from {addr}")
+                    datagrams = await receiver.receive()
+                    if not datagrams:
+                        continue
 
-                    # Feed packet to QUIC connection
-                    self._quic.receive_datagram(data, addr, now=time.time())
+                    # Feed the burst to the QUIC connection
+                    now = time.time()
+                    for data, addr in datagrams:
+                        logger.debug(
+                            "Client received %s bytes from %s", len(data), addr
+                        )
+                        self._quic.receive_datagram(data, addr, now=now)
 
                     # Batch process events
                     await self._process_quic_events_batched()
 
                     # Send any response packets
-                    await self._transmit()
+                    await self._transmit(now)
 
                 except trio.ClosedResourceError:
                     logger.debug("Client socket closed")
@@ -1220,33 +1232,35 @@ class QUICConnection(IRawConnection, IMuxedConn):
 
     # Network transmission
 
-    async def _transmit(self) -> None:
-        """Transmit pending QUIC packets using available socket."""
+    async def _transmit(self, now: float | None = None) -> None:
+        """
+        Transmit pending QUIC packets using available socket.
+
+        Args:
+            now: Timestamp already taken for the datagram that triggered this
+                send, so one tick's QUIC calls share a single clock read
+
+        """
         sock = self._socket
         if not sock:
             logger.debug("No socket to transmit")
             return
 
         try:
-            current_time = time.time()
-            datagrams = self._quic.datagrams_to_send(now=current_time)
-
-            # Batch stats updates
-            packet_count = 0
-            total_bytes = 0
+            datagrams = self._quic.datagrams_to_send(
+                now=time.time() if now is None else now
+            )
 
-            for data, addr in datagrams:
-                await sock.sendto(data, addr)
-                packet_count += 1
-                total_bytes += len(data)
+            if datagrams:
+                # Hand the whole burst to the kernel in as few syscalls as possible
+                await send_datagrams(sock, datagrams)
 
-            # Update stats in batch
-            if packet_count > 0:
-                self._stats["packets_sent"] += packet_count
-                self._stats["bytes_sent"] += total_bytes
+                # Update stats in batch
+                self._stats["packets_sent"] += len(datagrams)
+                self._stats["bytes_sent"] += sum(len(data) for data, _ in datagrams)
 
-        except Exception as e:
-            logger.error(f"Transmission error: {e}")
+        except (OSError, trio.ClosedResourceError, QuicConnectionError) as e:
+            logger.error("Transmission error: %s", e)
             await self._handle_connection_error(e)
 
     # Additional methods for stream data processing
@@ -1366,8 +1380,8 @@ class QUICConnection(IRawConnection, IMuxedConn):
         """Cleanup using connection ID as a fallback method."""
         try:
             for listener in self._transport._listeners:
-                for tracked_cid, tracked_conn in list(listener._connections.items()):
-                    if tracked_conn is self:
+                for tracked_cid, entry in list(listener._conns.items()):
+                    if entry.connection is self:
                         await listener._remove_connection(tracked_cid)
                         logger.debug(f"Removed connection {tracked_cid.hex()}")
                         return
@@ -2,16 +2,25 @@
 QUIC Listener
 """
 
+from collections.abc import Awaitable, Callable
 import logging
+import secrets
 import socket
 import struct
-import sys
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from aioquic.quic import events
 from aioquic.quic.configuration import QuicConfiguration
-from aioquic.quic.connection import QuicConnection
+from aioquic.quic.connection import QuicConnection, QuicConnectionError
+from aioquic.quic.events import (
+    ConnectionIdIssued,
+    ConnectionIdRetired,
+    ConnectionTerminated,
+    HandshakeCompleted,
+    QuicEvent,
+    StreamDataReceived,
+    StreamReset,
+)
 from aioquic.quic.packet import QuicPacketType
 from multiaddr import Multiaddr
 import trio
@@ -28,26 +37,64 @@ from libp2p.transport.quic.security import (
 
 from .config import QUICTransportConfig
 from .connection import QUICConnection
-from .exceptions import QUICListenError
+from .exceptions import (
+    QUICInvalidMultiaddrError,
+    QUICListenError,
+    QUICUnsupportedVersionError,
+)
+from .udp import DatagramReceiver, send_datagrams, set_socket_buffer_sizes
 from .utils import (
     create_quic_multiaddr,
     create_server_config_from_base,
     custom_quic_version_to_wire_format,
-    is_quic_multiaddr,
-    multiaddr_to_quic_version,
-    quic_multiaddr_to_endpoint,
+    parse_quic_multiaddr,
 )
 
 if TYPE_CHECKING:
     from .transport import QUICTransport
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] [%(name)s] %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+# QUIC variable-length integer encoding (RFC 9000, Section 16), indexed by
+# the two-bit length prefix
+_VARINT_LEN = (1, 2, 4, 8)
+_VARINT_MASK = (0x3F, 0x3FFF, 0x3FFFFFFF, 0x3FFFFFFFFFFFFFFF)
+
+# Fixed-layout long header prefix: first byte, version, destination CID length
+_LONG_HEADER_PREFIX = struct.Struct("!BIB")
+
+# Handler signature for the listener's QUIC event dispatch table
+_QUICEventHandler = Callable[
+    [Any, QuicConnection, tuple[str, int], bytes], Awaitable[bool]
+]
+
+# We are using standard CID length everywhere, so short headers carry
+# an 8-byte destination connection ID
+_SHORT_HEADER_CID_LEN = 8
+
+# Bytes of CSPRNG output fetched per refill of the connection ID pool
+_CID_POOL_SIZE = 256 * _SHORT_HEADER_CID_LEN
+
+# Frame type bytes reported by the transmit diagnostics
+_FRAME_TYPE_LABELS = {
+    0x00: "PADDING/PING",
+    0x01: "PADDING/PING",
+    0x02: "ACK",
+    0x06: "CRYPTO",
+}
+
+# Slow-path packet dispatch: a fixed pool of workers drains a bounded queue,
+# so a handshake flood applies back-pressure instead of spawning a task each
+_PACKET_WORKERS = 4
+_PACKET_QUEUE_SIZE = 1024
+
+# Long header packet types, indexed by the two type bits of the first byte
+_LONG_PACKET_TYPES = (
+    QuicPacketType.INITIAL,
+    QuicPacketType.ZERO_RTT,
+    QuicPacketType.HANDSHAKE,
+    QuicPacketType.RETRY,
+)
 
 
 class QUICPacketInfo:
@@ -68,6 +115,27 @@ class QUICPacketInfo:
         self.token = token
 
 
+class ConnEntry:
+    """Routing table entry for a connection tracked by the listener."""
+
+    __slots__ = ("cid_hex", "addr", "state", "quic_conn", "connection", "lock")
+
+    STATE_PENDING = 0
+    STATE_ESTABLISHED = 1
+
+    def __init__(
+        self, dest_cid: bytes, addr: tuple[str, int], quic_conn: QuicConnection
+    ):
+        # Formatted once for logging instead of on every message
+        self.cid_hex = dest_cid.hex()
+        self.addr = addr
+        self.state = self.STATE_PENDING
+        self.quic_conn = quic_conn
+        self.connection: QUICConnection | None = None
+        # Serializes handshake processing for this connection
+        self.lock = trio.Lock()
+
+
 class QUICListener(IListener):
     """
     QUIC Listener with connection ID handling and protocol negotiation.
@@ -93,27 +161,43 @@ class QUICListener(IListener):
         self._bound_addresses: list[Multiaddr] = []
 
         # Enhanced connection management with connection ID routing
-        self._connections: dict[
-            bytes, QUICConnection
-        ] = {}  # destination_cid -> connection
-        self._pending_connections: dict[
-            bytes, QuicConnection
-        ] = {}  # destination_cid -> quic_conn
+        self._conns: dict[bytes, ConnEntry] = {}  # destination_cid -> entry
         self._addr_to_cid: dict[
             tuple[str, int], bytes
         ] = {}  # (host, port) -> destination_cid
-        self._cid_to_addr: dict[
-            bytes, tuple[str, int]
-        ] = {}  # destination_cid -> (host, port)
+        self._pending_count = 0  # entries in _conns still in STATE_PENDING
         self._connection_lock = trio.Lock()
 
+        # Random routing CIDs, read from the CSPRNG in bulk
+        self._cid_pool = b""
+        self._cid_pool_offset = 0
+
         # Version negotiation support
-        self._supported_versions = self._get_supported_versions()
+        self._supported_versions, self._sorted_versions = self._get_supported_versions()
+        self._version_block = struct.pack(
+            f"!{len(self._sorted_versions)}I", *self._sorted_versions
+        )
+        self._wire_version_to_config = self._get_wire_version_configs()
+
+        # QUIC event dispatch, keyed by exact event type
+        self._event_handlers: dict[type[QuicEvent], _QUICEventHandler] = {
+            ConnectionTerminated: self._on_connection_terminated,
+            HandshakeCompleted: self._on_handshake_completed,
+            StreamDataReceived: self._on_stream_data_received,
+            StreamReset: self._on_stream_reset,
+            ConnectionIdIssued: self._on_connection_id_issued,
+            ConnectionIdRetired: self._on_connection_id_retired,
+        }
 
         # Listener state
         self._closed = False
         self._listening = False
         self._nursery: trio.Nursery | None = None
+        self._packet_send: trio.MemorySendChannel[tuple[bytes, tuple[str, int]]]
+        self._packet_receive: trio.MemoryReceiveChannel[tuple[bytes, tuple[str, int]]]
+        self._packet_send, self._packet_receive = trio.open_memory_channel(
+            _PACKET_QUEUE_SIZE
+        )
 
         # Performance tracking
         self._stats = {
@@ -125,8 +209,24 @@ class QUICListener(IListener):
             "invalid_packets": 0,
         }
 
-    def _get_supported_versions(self) -> set[int]:
-        """Get wire format versions for all supported QUIC configurations."""
+    def _fresh_cid(self) -> bytes:
+        """Take a random connection ID from the prefilled pool."""
+        if self._cid_pool_offset >= len(self._cid_pool):
+            self._cid_pool = secrets.token_bytes(_CID_POOL_SIZE)
+            self._cid_pool_offset = 0
+        offset = self._cid_pool_offset
+        self._cid_pool_offset = offset + _SHORT_HEADER_CID_LEN
+        return self._cid_pool[offset : offset + _SHORT_HEADER_CID_LEN]
+
+    def _get_supported_versions(self) -> tuple[frozenset[int], tuple[int, ...]]:
+        """
+        Get wire format versions for all supported QUIC configurations.
+
+        Returns:
+            The versions as a frozenset for membership checks, and as a
+            sorted tuple for version negotiation
+
+        """
         versions: set[int] = set()
         for protocol in self._quic_configs:
             try:
@@ -136,12 +236,27 @@ class QUICListener(IListener):
                     versions.add(version)
             except Exception as e:
                 logger.warning(f"Failed to get wire version for {protocol}: {e}")
-        return versions
+        return frozenset(versions), tuple(sorted(versions))
+
+    def _get_wire_version_configs(self) -> dict[int, QuicConfiguration]:
+        """Map each wire format version to the first matching QUIC configuration."""
+        configs: dict[int, QuicConfiguration] = {}
+        for protocol, config in self._quic_configs.items():
+            try:
+                wire_version = custom_quic_version_to_wire_format(protocol)
+            except QUICUnsupportedVersionError as e:
+                logger.warning(f"Failed to get wire version for {protocol}: {e}")
+                continue
+            configs.setdefault(wire_version, config)
+        return configs
 
-    def parse_quic_packet(self, data: bytes) -> QUICPacketInfo | None:
+    def parse_quic_packet(self, data: bytes | memoryview) -> QUICPacketInfo | None:
         """
         Parse QUIC packet header to extract connection IDs and version.
         Based on RFC 9000 packet format.
+
+        Accepts a memoryview over a receive buffer; only the connection IDs
+        and token are copied out.
         """
         try:
             if len(data) < 1:
@@ -154,12 +269,12 @@ class QUICListener(IListener):
             is_long_header = (first_byte & 0x80) != 0
 
             if not is_long_header:
-                cid_length = 8  # We are using standard CID length everywhere
+                cid_length = _SHORT_HEADER_CID_LEN
 
                 if len(data) < 1 + cid_length:
                     return None
 
-                dest_cid = data[1 : 1 + cid_length]
+                dest_cid = bytes(data[1 : 1 + cid_length])
 
                 return QUICPacketInfo(
                     version=1,  # Assume QUIC v1 for established connections
@@ -169,106 +284,107 @@ class QUICListener(IListener):
                     token=b"",
                 )
 
-            # Long header packet parsing
-            offset = 1
-
-            # Extract version (4 bytes)
-            if len(data) < offset + 4:
-                return None
-            version = struct.unpack("!I", data[offset : offset + 4])[0]
-            offset += 4
-
-            # Extract destination connection ID length and value
-            if len(data) < offset + 1:
-                return None
-            dest_cid_len = data[offset]
-            offset += 1
-
-            if len(data) < offset + dest_cid_len:
+            # Long header packet parsing: first byte, version and destination
+            # connection ID length form a fixed 6-byte prefix
+            if len(data) < _LONG_HEADER_PREFIX.size + 1:
                 return None
-            dest_cid = data[offset : offset + dest_cid_len]
-            offset += dest_cid_len
+            _, version, dest_cid_len = _LONG_HEADER_PREFIX.unpack_from(data, 0)
+            offset = _LONG_HEADER_PREFIX.size + dest_cid_len
 
-            # Extract source connection ID length and value
-            if len(data) < offset + 1:
+            # Destination connection ID, then source connection ID length
+            if len(data) <= offset:
                 return None
+            dest_cid = bytes(data[_LONG_HEADER_PREFIX.size : offset])
             src_cid_len = data[offset]
             offset += 1
 
             if len(data) < offset + src_cid_len:
                 return None
-            src_cid = data[offset : offset + src_cid_len]
+            src_cid = bytes(data[offset : offset + src_cid_len])
             offset += src_cid_len
 
             # Determine packet type from first byte
             packet_type_value = (first_byte & 0x30) >> 4
 
-            packet_value_to_type_mapping = {
-                0: QuicPacketType.INITIAL,
-                1: QuicPacketType.ZERO_RTT,
-                2: QuicPacketType.HANDSHAKE,
-                3: QuicPacketType.RETRY,
-                4: QuicPacketType.VERSION_NEGOTIATION,
-                5: QuicPacketType.ONE_RTT,
-            }
-
             # For Initial packets, extract token
             token = b""
             if packet_type_value == 0:  # Initial packet
                 if len(data) < offset + 1:
                     return None
-                # Token length is variable-length integer
-                token_len, token_len_bytes = self._decode_varint(data[offset:])
+                # Token length is variable-length integer, at most 8 bytes, so
+                # don't copy the remainder of the datagram to decode it
+                token_len, token_len_bytes = self._decode_varint(
+                    data[offset : offset + 8]
+                )
                 offset += token_len_bytes
 
                 if len(data) < offset + token_len:
                     return None
-                token = data[offset : offset + token_len]
+                token = bytes(data[offset : offset + token_len])
 
             return QUICPacketInfo(
                 version=version,
                 destination_cid=dest_cid,
                 source_cid=src_cid,
-                packet_type=packet_value_to_type_mapping.get(packet_type_value)
-                or QuicPacketType.INITIAL,
+                packet_type=_LONG_PACKET_TYPES[packet_type_value],
                 token=token,
             )
 
         except Exception as e:
-            logger.debug(f"Failed to parse QUIC packet: {e}")
+            logger.debug("Failed to parse QUIC packet: %s", e)
             return None
 
-    def _decode_varint(self, data: bytes) -> tuple[int, int]:
+    def _decode_varint(self, data: bytes | memoryview) -> tuple[int, int]:
         """Decode QUIC variable-length integer."""
         if len(data) < 1:
             return 0, 0
 
-        first_byte = data[0]
-        length_bits = (first_byte & 0xC0) >> 6
-
-        if length_bits == 0:
-            return first_byte & 0x3F, 1
-        elif length_bits == 1:
-            if len(data) < 2:
-                return 0, 0
-            return ((first_byte & 0x3F) << 8) | data[1], 2
-        elif length_bits == 2:
-            if len(data) < 4:
-                return 0, 0
-            return ((first_byte & 0x3F) << 24) | (data[1] << 16) | (
-                data[2] << 8
-            ) | data[3], 4
-        else:  # length_bits == 3
-            if len(data) < 8:
-                return 0, 0
-            value = (first_byte & 0x3F) << 56
-            for i in range(1, 8):
-                value |= data[i] << (8 * (7 - i))
-            return value, 8
+        # The two high bits of the first byte encode the integer length
+        prefix = data[0] >> 6
+        length = _VARINT_LEN[prefix]
+        if len(data) < length:
+            return 0, 0
+
+        return int.from_bytes(data[:length], "big") & _VARINT_MASK[prefix], length
+
+    def _short_header_connection(
+        self, data: bytes, addr: tuple[str, int]
+    ) -> QUICConnection | None:
+        """
+        Find the established connection for a short header packet.
+
+        After the handshake every packet carries a short header, so this
+        routes steady-state traffic without parsing the header or taking the
+        listener lock. Returns None for any packet needing the full path.
+        """
+        if not data or data[0] & 0x80:
+            return None
+
+        entry = self._conns.get(data[1 : 1 + _SHORT_HEADER_CID_LEN])
+        if entry is None:
+            # The peer may have switched to a CID issued after routing
+            addr_cid = self._addr_to_cid.get(addr)
+            entry = self._conns.get(addr_cid) if addr_cid else None
+        return entry.connection if entry else None
+
+    async def _process_short_header_packet(
+        self, connection: QUICConnection, data: bytes, addr: tuple[str, int]
+    ) -> None:
+        """Feed a short header packet to its established connection."""
+        self._stats["packets_processed"] += 1
+        self._stats["bytes_received"] += len(data)
+        await self._handle_established_connection_packet(
+            connection, data, addr, data[1 : 1 + _SHORT_HEADER_CID_LEN], time.time()
+        )
 
     async def _process_packet(self, data: bytes, addr: tuple[str, int]) -> None:
         """Process incoming QUIC packet with optimized routing."""
         try:
+            connection = self._short_header_connection(data, addr)
+            if connection is not None:
+                await self._process_short_header_packet(connection, data, addr)
+                return
+
             self._stats["packets_processed"] += 1
             self._stats["bytes_received"] += len(data)
 
@@ -279,27 +395,34 @@ class QUICListener(IListener):
 
             dest_cid = packet_info.destination_cid
 
-            # Single lock acquisition with all lookups
+            # One timestamp for every QUIC call made on behalf of this datagram
+            now = time.time()
+
+            # The listener-wide lock only guards the routing tables; QUIC work
+            # runs outside it so different connections don't serialize
             async with self._connection_lock:
-                connection_obj = self._connections.get(dest_cid)
-                pending_quic_conn = self._pending_connections.get(dest_cid)
-
-                if not connection_obj and not pending_quic_conn:
-                    if packet_info.packet_type == QuicPacketType.INITIAL:
-                        pending_quic_conn = await self._handle_new_connection(
-                            data, addr, packet_info
-                        )
-                    else:
+                entry = self._conns.get(dest_cid)
+
+            if entry is None:
+                if packet_info.packet_type == QuicPacketType.INITIAL:
+                    await self._handle_new_connection(data, addr, packet_info, now)
+                return
+
+            if entry.state == ConnEntry.STATE_PENDING:
+                # Handshake packets for a single connection are fed in order
+                async with entry.lock:
+                    if entry.state == ConnEntry.STATE_PENDING:
+                        if self._conns.get(dest_cid) is entry:
+                            await self._handle_pending_connection_packet(
+                                entry, data, addr, dest_cid, now
+                            )
                         return
 
-            # Process outside the lock
-            if connection_obj:
+                # Promoted while waiting for the connection lock
+
+            if entry.connection:
                 await self._handle_established_connection_packet(
-                    connection_obj, data, addr, dest_cid
-                )
-            elif pending_quic_conn:
-                await self._handle_pending_connection_packet(
-                    pending_quic_conn, data, addr, dest_cid
+                    entry.connection, data, addr, dest_cid, now
                 )
 
         except Exception as e:
@@ -311,37 +434,42 @@ class QUICListener(IListener):
         data: bytes,
         addr: tuple[str, int],
         dest_cid: bytes,
+        now: float,
     ) -> None:
         """Handle packet for established connection WITHOUT holding connection lock."""
         try:
-            await self._route_to_connection(connection_obj, data, addr)
+            await self._route_to_connection(connection_obj, data, addr, now)
 
         except Exception as e:
             logger.error(f"Error handling established connection packet: {e}")
 
     async def _handle_pending_connection_packet(
         self,
-        quic_conn: QuicConnection,
+        entry: ConnEntry,
         data: bytes,
         addr: tuple[str, int],
         dest_cid: bytes,
+        now: float,
     ) -> None:
         """Handle packet for pending connection WITHOUT holding connection lock."""
+        quic_conn = entry.quic_conn
         try:
-            logger.debug(f"Handling packet for pending connection {dest_cid.hex()}")
-            logger.debug(f"Packet size: {len(data)} bytes from {addr}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handling packet for pending connection %s: %s bytes from %s",
+                    entry.cid_hex,
+                    len(data),
+                    addr,
+                )
 
             # Feed data to QUIC connection
-            quic_conn.receive_datagram(data, addr, now=time.time())
-            logger.debug("PENDING: Datagram received by QUIC connection")
+            quic_conn.receive_datagram(data, addr, now=now)
 
             # Process events - this is crucial for handshake progression
-            logger.debug("Processing QUIC events...")
             await self._process_quic_events(quic_conn, addr, dest_cid)
 
             # Send any outgoing packets
-            logger.debug("Transmitting response...")
-            await self._transmit_for_connection(quic_conn, addr)
+            await self._transmit_for_connection(quic_conn, addr, now)
 
             # Check if handshake completed (with minimal locking)
             if quic_conn._handshake_complete:
@@ -351,7 +479,7 @@ class QUICListener(IListener):
                 logger.debug("Handshake still in progress")
 
         except Exception as e:
-            logger.error(f"Error handling pending connection {dest_cid.hex()}: {e}")
+            logger.error(f"Error handling pending connection {entry.cid_hex}: {e}")
 
     async def _send_version_negotiation(
         self, addr: tuple[str, int], source_cid: bytes
@@ -360,52 +488,45 @@ class QUICListener(IListener):
         try:
             self._stats["version_negotiations"] += 1
 
-            # Construct version negotiation packet
-            packet = bytearray()
-
-            # First byte: long header (1) + unused bits (0111)
-            packet.append(0x80 | 0x70)
-
-            # Version: 0 for version negotiation
-            packet.extend(struct.pack("!I", 0))
-
-            # Destination connection ID (echo source CID from client)
-            packet.append(len(source_cid))
-            packet.extend(source_cid)
+            # The packet size is fully known up front: fixed prefix, echoed
+            # CID, empty source CID length byte and the version list
+            cid_end = _LONG_HEADER_PREFIX.size + len(source_cid)
+            packet = bytearray(cid_end + 1 + len(self._version_block))
 
-            # Source connection ID (empty for version negotiation)
-            packet.append(0)
+            # Long header (1) + unused bits (0111), version 0 for version
+            # negotiation, then echo the client's source CID as destination
+            _LONG_HEADER_PREFIX.pack_into(packet, 0, 0x80 | 0x70, 0, len(source_cid))
+            packet[_LONG_HEADER_PREFIX.size : cid_end] = source_cid
 
-            # Supported versions
-            for version in sorted(self._supported_versions):
-                packet.extend(struct.pack("!I", version))
+            # Source connection ID (empty for version negotiation) is left
+            # zeroed, followed by the versions serialized once at init
+            packet[cid_end + 1 :] = self._version_block
 
             # Send the packet
             if self._socket:
-                await self._socket.sendto(bytes(packet), addr)
+                await self._socket.sendto(packet, addr)
                 logger.debug(
-                    f"Sent version negotiation to {addr} "
-                    f"with versions {sorted(self._supported_versions)}"
+                    "Sent version negotiation to %s with versions %s",
+                    addr,
+                    self._sorted_versions,
                 )
 
         except Exception as e:
             logger.error(f"Failed to send version negotiation to {addr}: {e}")
 
     async def _handle_new_connection(
-        self, data: bytes, addr: tuple[str, int], packet_info: QUICPacketInfo
+        self,
+        data: bytes,
+        addr: tuple[str, int],
+        packet_info: QUICPacketInfo,
+        now: float,
     ) -> QuicConnection | None:
         """Handle new connection with proper connection ID handling."""
         try:
-            logger.debug(f"Starting handshake for {addr}")
+            logger.debug("Starting handshake for %s", addr)
 
             # Find appropriate QUIC configuration
-            quic_config = None
-
-            for protocol, config in self._quic_configs.items():
-                wire_versions = custom_quic_version_to_wire_format(protocol)
-                if wire_versions == packet_info.version:
-                    quic_config = config
-                    break
+            quic_config = self._wire_version_to_config.get(packet_info.version)
 
             if not quic_config:
                 logger.error(
@@ -426,21 +547,15 @@ class QUICListener(IListener):
 
             # Validate certificate has libp2p extension
             if server_config.certificate:
-                cert = server_config.certificate
-                has_libp2p_ext = False
-                for ext in cert.extensions:
-                    if ext.oid == LIBP2P_TLS_EXTENSION_OID:
-                        has_libp2p_ext = True
-                        break
-                logger.debug(f"Certificate has libp2p extension: {has_libp2p_ext}")
+                has_libp2p_ext = any(
+                    ext.oid == LIBP2P_TLS_EXTENSION_OID
+                    for ext in server_config.certificate.extensions
+                )
+                logger.debug("Certificate has libp2p extension: %s", has_libp2p_ext)
 
                 if not has_libp2p_ext:
                     logger.error("Certificate missing libp2p extension!")
 
-            logger.debug(
-                f"Original destination CID: {packet_info.destination_cid.hex()}"
-            )
-
             quic_conn = QuicConnection(
                 configuration=server_config,
                 original_destination_connection_id=packet_info.destination_cid,
@@ -450,45 +565,56 @@ class QUICListener(IListener):
             # Use the first host CID as our routing CID
             if quic_conn._host_cids:
                 destination_cid = quic_conn._host_cids[0].cid
-                logger.debug(f"Using host CID as routing CID: {destination_cid.hex()}")
             else:
                 # Fallback to random if no host CIDs generated
-                import secrets
+                destination_cid = self._fresh_cid()
 
-                destination_cid = secrets.token_bytes(8)
-                logger.debug(f"Fallback to random CID: {destination_cid.hex()}")
+            entry = ConnEntry(destination_cid, addr, quic_conn)
 
-            logger.debug(f"Generated {len(quic_conn._host_cids)} host CIDs for client")
-
-            logger.debug(
-                f"QUIC connection created for destination CID {destination_cid.hex()}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "QUIC connection created for destination CID %s "
+                    "(original destination CID: %s, %s host CIDs generated)",
+                    entry.cid_hex,
+                    packet_info.destination_cid.hex(),
+                    len(quic_conn._host_cids),
+                )
 
             # Store connection mapping using our generated CID
-            self._pending_connections[destination_cid] = quic_conn
-            self._addr_to_cid[addr] = destination_cid
-            self._cid_to_addr[destination_cid] = addr
-
-            # Process initial packet
-            quic_conn.receive_datagram(data, addr, now=time.time())
-            if quic_conn.tls:
-                if self._security_manager:
-                    try:
-                        quic_conn.tls._request_client_certificate = True
-                        logger.debug(
-                            "request_client_certificate set to True in server TLS"
-                        )
-                    except Exception as e:
-                        logger.error(f"FAILED to apply request_client_certificate: {e}")
-
-            # Process events and send response
-            await self._process_quic_events(quic_conn, addr, destination_cid)
-            await self._transmit_for_connection(quic_conn, addr)
-
-            logger.debug(
-                f"Started handshake for new connection from {addr} "
-                f"(version: 0x{packet_info.version:08x}, cid: {destination_cid.hex()})"
-            )
+            async with self._connection_lock:
+                # close() may have emptied the table while we waited
+                if self._closed:
+                    return None
+                self._track_entry(destination_cid, entry)
+                self._addr_to_cid[addr] = destination_cid
+
+            async with entry.lock:
+                # Process initial packet
+                quic_conn.receive_datagram(data, addr, now=now)
+                if quic_conn.tls:
+                    if self._security_manager:
+                        try:
+                            quic_conn.tls._request_client_certificate = True
+                            logger.debug(
+                                "request_client_certificate set to True in server TLS"
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f"FAILED to apply request_client_certificate: {e}"
+                            )
+
+                # Process events and send response
+                await self._process_quic_events(quic_conn, addr, destination_cid)
+                await self._transmit_for_connection(quic_conn, addr, now)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Started handshake for new connection from %s "
+                    "(version: 0x%08x, cid: %s)",
+                    addr,
+                    packet_info.version,
+                    entry.cid_hex,
+                )
 
             return quic_conn
 
@@ -497,96 +623,33 @@ class QUICListener(IListener):
             self._stats["connections_rejected"] += 1
             return None
 
-    async def _handle_short_header_packet(
-        self, data: bytes, addr: tuple[str, int]
-    ) -> None:
-        """Handle short header packets for established connections."""
-        try:
-            logger.debug(f" SHORT_HDR: Handling short header packet from {addr}")
-
-            # First, try address-based lookup
-            dest_cid = self._addr_to_cid.get(addr)
-            if dest_cid and dest_cid in self._connections:
-                connection = self._connections[dest_cid]
-                await self._route_to_connection(connection, data, addr)
-                return
-
-            # Fallback: try to extract CID from packet
-            if len(data) >= 9:  # 1 byte header + 8 byte CID
-                potential_cid = data[1:9]
-
-                if potential_cid in self._connections:
-                    connection = self._connections[potential_cid]
-
-                    # Update mappings for future packets
-                    self._addr_to_cid[addr] = potential_cid
-                    self._cid_to_addr[potential_cid] = addr
-
-                    await self._route_to_connection(connection, data, addr)
-                    return
-
-            logger.debug(f"❌ SHORT_HDR: No matching connection found for {addr}")
-
-        except Exception as e:
-            logger.error(f"Error handling short header packet from {addr}: {e}")
-
     async def _route_to_connection(
-        self, connection: QUICConnection, data: bytes, addr: tuple[str, int]
+        self,
+        connection: QUICConnection,
+        data: bytes,
+        addr: tuple[str, int],
+        now: float,
     ) -> None:
         """Route packet to existing connection."""
         try:
             # Feed data to the connection's QUIC instance
-            connection._quic.receive_datagram(data, addr, now=time.time())
+            connection._quic.receive_datagram(data, addr, now=now)
 
             # Process events and handle responses
             await connection._process_quic_events()
-            await connection._transmit()
+            await connection._transmit(now)
 
         except Exception as e:
             logger.error(f"Error routing packet to connection {addr}: {e}")
             # Remove problematic connection
             await self._remove_connection_by_addr(addr)
 
-    async def _handle_pending_connection(
-        self,
-        quic_conn: QuicConnection,
-        data: bytes,
-        addr: tuple[str, int],
-        dest_cid: bytes,
-    ) -> None:
-        """Handle packet for a pending (handshaking) connection."""
-        try:
-            logger.debug(f"Handling packet for pending connection {dest_cid.hex()}")
-
-            # Feed data to QUIC connection
-            quic_conn.receive_datagram(data, addr, now=time.time())
-
-            if quic_conn.tls:
-                logger.debug(f"TLS state after: {quic_conn.tls.state}")
-
-            # Process events - this is crucial for handshake progression
-            await self._process_quic_events(quic_conn, addr, dest_cid)
-
-            # Send any outgoing packets - this is where the response should be sent
-            await self._transmit_for_connection(quic_conn, addr)
-
-            # Check if handshake completed
-            if quic_conn._handshake_complete:
-                logger.debug("PENDING: Handshake completed, promoting connection")
-                await self._promote_pending_connection(quic_conn, addr, dest_cid)
-
-        except Exception as e:
-            logger.error(f"Error handling pending connection {dest_cid.hex()}: {e}")
-
-            # Remove problematic pending connection
-            logger.error(f"Removing problematic connection {dest_cid.hex()}")
-            await self._remove_pending_connection(dest_cid)
-
     async def _process_quic_events(
         self, quic_conn: QuicConnection, addr: tuple[str, int], dest_cid: bytes
     ) -> None:
         """Process QUIC events with enhanced debugging."""
         try:
+            handlers = self._event_handlers
             events_processed = 0
             while True:
                 event = quic_conn.next_event()
@@ -594,180 +657,257 @@ class QUICListener(IListener):
                     break
 
                 events_processed += 1
-                logger.debug(
-                    "QUIC EVENT: Processing event "
-                    f"{events_processed}: {type(event).__name__}"
-                )
-
-                if isinstance(event, events.ConnectionTerminated):
+                if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(
-                        "QUIC EVENT: Connection terminated "
-                        f"- code: {event.error_code}, reason: {event.reason_phrase}"
-                        f"Connection {dest_cid.hex()} from {addr} "
-                        f"terminated: {event.reason_phrase}"
+                        "QUIC EVENT: Processing event %s: %s",
+                        events_processed,
+                        type(event).__name__,
                     )
-                    await self._remove_connection(dest_cid)
+
+                handler = handlers.get(type(event))
+                if handler is None:
+                    logger.warning(f"Unhandled event type: {type(event).__name__}")
+                elif await handler(event, quic_conn, addr, dest_cid):
                     break
 
-                elif isinstance(event, events.HandshakeCompleted):
-                    logger.debug(
-                        "QUIC EVENT: Handshake completed for connection "
-                        f"{dest_cid.hex()}"
-                    )
-                    logger.debug(f"Handshake completed for connection {dest_cid.hex()}")
-                    await self._promote_pending_connection(quic_conn, addr, dest_cid)
+        except Exception as e:
+            logger.debug("❌ EVENT: Error processing events: %s", e)
 
-                elif isinstance(event, events.StreamDataReceived):
-                    logger.debug(
-                        f"QUIC EVENT: Stream data received on stream {event.stream_id}"
-                    )
-                    if dest_cid in self._connections:
-                        connection = self._connections[dest_cid]
-                        await connection._handle_stream_data(event)
+    # QUIC event handlers, dispatched by event type from _process_quic_events.
+    # Each returns True when no further events should be processed.
 
-                elif isinstance(event, events.StreamReset):
-                    logger.debug(
-                        f"QUIC EVENT: Stream reset on stream {event.stream_id}"
-                    )
-                    if dest_cid in self._connections:
-                        connection = self._connections[dest_cid]
-                        await connection._handle_stream_reset(event)
+    async def _on_connection_terminated(
+        self,
+        event: ConnectionTerminated,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Remove the connection once aioquic reports it terminated."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "QUIC EVENT: Connection %s from %s terminated - code: %s, reason: %s",
+                dest_cid.hex(),
+                addr,
+                event.error_code,
+                event.reason_phrase,
+            )
+        await self._remove_connection(dest_cid)
+        return True
 
-                elif isinstance(event, events.ConnectionIdIssued):
-                    logger.debug(
-                        f"QUIC EVENT: Connection ID issued: {event.connection_id.hex()}"
-                    )
-                    # Add new CID to the same address mapping
-                    taddr = self._cid_to_addr.get(dest_cid)
-                    if taddr:
-                        # Don't overwrite, but this CID is also valid for this address
-                        logger.debug(
-                            f"QUIC EVENT: New CID {event.connection_id.hex()} "
-                            f"available for {taddr}"
-                        )
-
-                elif isinstance(event, events.ConnectionIdRetired):
-                    logger.info(f"Connection ID retired: {event.connection_id.hex()}")
-                    retired_cid = event.connection_id
-                    if retired_cid in self._cid_to_addr:
-                        addr = self._cid_to_addr[retired_cid]
-                        del self._cid_to_addr[retired_cid]
-                        # Only remove addr mapping if this was the active CID
-                        if self._addr_to_cid.get(addr) == retired_cid:
-                            del self._addr_to_cid[addr]
-                else:
-                    logger.warning(f"Unhandled event type: {type(event).__name__}")
+    async def _on_handshake_completed(
+        self,
+        event: HandshakeCompleted,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Promote the pending connection when its handshake completes."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "QUIC EVENT: Handshake completed for connection %s", dest_cid.hex()
+            )
+        await self._promote_pending_connection(quic_conn, addr, dest_cid)
+        return False
 
-        except Exception as e:
-            logger.debug(f"❌ EVENT: Error processing events: {e}")
+    async def _on_stream_data_received(
+        self,
+        event: StreamDataReceived,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Forward stream data to the established connection."""
+        logger.debug("QUIC EVENT: Stream data received on stream %s", event.stream_id)
+        entry = self._conns.get(dest_cid)
+        if entry and entry.connection:
+            await entry.connection._handle_stream_data(event)
+        return False
+
+    async def _on_stream_reset(
+        self,
+        event: StreamReset,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Forward a stream reset to the established connection."""
+        logger.debug("QUIC EVENT: Stream reset on stream %s", event.stream_id)
+        entry = self._conns.get(dest_cid)
+        if entry and entry.connection:
+            await entry.connection._handle_stream_reset(event)
+        return False
+
+    async def _on_connection_id_issued(
+        self,
+        event: ConnectionIdIssued,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Log a connection ID newly issued for this connection."""
+        # Nothing to route: the new CID is only reported, never mapped
+        if not logger.isEnabledFor(logging.DEBUG):
+            return False
+
+        new_cid_hex = event.connection_id.hex()
+        logger.debug("QUIC EVENT: Connection ID issued: %s", new_cid_hex)
+        entry = self._conns.get(dest_cid)
+        if entry:
+            # Don't overwrite, but this CID is also valid for this address
+            logger.debug(
+                "QUIC EVENT: New CID %s available for %s (connection %s)",
+                new_cid_hex,
+                entry.addr,
+                entry.cid_hex,
+            )
+        return False
+
+    async def _on_connection_id_retired(
+        self,
+        event: ConnectionIdRetired,
+        quic_conn: QuicConnection,
+        addr: tuple[str, int],
+        dest_cid: bytes,
+    ) -> bool:
+        """Drop the address mapping for a retired routing CID."""
+        retired_cid = event.connection_id
+        entry = self._conns.get(retired_cid)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Connection ID retired: %s",
+                entry.cid_hex if entry else retired_cid.hex(),
+            )
+        # Only remove addr mapping if this was the active CID
+        if entry and self._addr_to_cid.get(entry.addr) == retired_cid:
+            del self._addr_to_cid[entry.addr]
+        return False
 
     async def _promote_pending_connection(
         self, quic_conn: QuicConnection, addr: tuple[str, int], dest_cid: bytes
     ) -> None:
         """Promote pending connection - avoid duplicate creation."""
         try:
-            self._pending_connections.pop(dest_cid, None)
+            entry = self._conns.get(dest_cid)
+            if entry is None:
+                if self._closed:
+                    return
+                entry = ConnEntry(dest_cid, addr, quic_conn)
+                self._track_entry(dest_cid, entry)
+            cid_hex = entry.cid_hex
+
+            # Both the HandshakeCompleted event and the post-packet check
+            # promote; only the first may connect and start the user handler
+            if entry.state == ConnEntry.STATE_ESTABLISHED:
+                logger.debug("⚠️ Connection %s is already established!", cid_hex)
+                return
 
-            if dest_cid in self._connections:
-                logger.debug(
-                    f"⚠️ Connection {dest_cid.hex()} already exists in _connections!"
-                )
-                connection = self._connections[dest_cid]
-            else:
-                from .connection import QUICConnection
-
-                host, port = addr
-                quic_version = "quic"
-                remote_maddr = create_quic_multiaddr(host, port, f"/{quic_version}")
-
-                connection = QUICConnection(
-                    quic_connection=quic_conn,
-                    remote_addr=addr,
-                    remote_peer_id=None,
-                    local_peer_id=self._transport._peer_id,
-                    is_initiator=False,
-                    maddr=remote_maddr,
-                    transport=self._transport,
-                    security_manager=self._security_manager,
-                    listener_socket=self._socket,
-                )
+            from .connection import QUICConnection
+
+            host, port = addr
+            quic_version = "quic"
+            remote_maddr = create_quic_multiaddr(host, port, f"/{quic_version}")
+
+            connection = QUICConnection(
+                quic_connection=quic_conn,
+                remote_addr=addr,
+                remote_peer_id=None,
+                local_peer_id=self._transport._peer_id,
+                is_initiator=False,
+                maddr=remote_maddr,
+                transport=self._transport,
+                security_manager=self._security_manager,
+                listener_socket=self._socket,
+            )
 
-                logger.debug(f"🔄 Created NEW QUICConnection for {dest_cid.hex()}")
+            logger.debug("🔄 Created NEW QUICConnection for %s", cid_hex)
 
-                self._connections[dest_cid] = connection
+            # Promote in place, no move between tables
+            self._mark_established(entry, connection)
 
+            entry.addr = addr
             self._addr_to_cid[addr] = dest_cid
-            self._cid_to_addr[dest_cid] = addr
 
             if self._nursery:
                 connection._nursery = self._nursery
                 await connection.connect(self._nursery)
-                logger.debug(f"Connection connected succesfully for {dest_cid.hex()}")
+                logger.debug("Connection connected succesfully for %s", cid_hex)
 
             if self._security_manager:
                 try:
                     peer_id = await connection._verify_peer_identity_with_security()
                     if peer_id:
                         connection.peer_id = peer_id
-                    logger.info(
-                        f"Security verification successful for {dest_cid.hex()}"
-                    )
+                    logger.info("Security verification successful for %s", cid_hex)
                 except Exception as e:
-                    logger.error(
-                        f"Security verification failed for {dest_cid.hex()}: {e}"
-                    )
+                    logger.error(f"Security verification failed for {cid_hex}: {e}")
                     await connection.close()
                     return
 
             if self._nursery:
                 connection._nursery = self._nursery
                 await connection._start_background_tasks()
-                logger.debug(
-                    f"Started background tasks for connection {dest_cid.hex()}"
-                )
-
-            try:
-                logger.debug(f"Invoking user callback {dest_cid.hex()}")
-                await self._handler(connection)
+                logger.debug("Started background tasks for connection %s", cid_hex)
 
-            except Exception as e:
-                logger.error(f"Error in user callback: {e}")
+            # The user callback may run for the connection's lifetime, so it
+            # must not hold up the packet worker that completed the handshake
+            if self._nursery:
+                self._nursery.start_soon(self._run_handler, connection, cid_hex)
+            else:
+                await self._run_handler(connection, cid_hex)
 
             self._stats["connections_accepted"] += 1
-            logger.info(f"Enhanced connection {dest_cid.hex()} established from {addr}")
+            logger.info("Enhanced connection %s established from %s", cid_hex, addr)
 
         except Exception as e:
             logger.error(f"❌ Error promoting connection {dest_cid.hex()}: {e}")
             await self._remove_connection(dest_cid)
 
-    async def _remove_connection(self, dest_cid: bytes) -> None:
-        """Remove connection by connection ID."""
+    async def _run_handler(self, connection: QUICConnection, cid_hex: str) -> None:
+        """Invoke the user callback for a newly established connection."""
         try:
-            # Remove connection
-            connection = self._connections.pop(dest_cid, None)
-            if connection:
-                await connection.close()
-
-            # Clean up mappings
-            addr = self._cid_to_addr.pop(dest_cid, None)
-            if addr:
-                self._addr_to_cid.pop(addr, None)
-
-            logger.debug(f"Removed connection {dest_cid.hex()}")
+            logger.debug("Invoking user callback %s", cid_hex)
+            await self._handler(connection)
 
         except Exception as e:
-            logger.error(f"Error removing connection {dest_cid.hex()}: {e}")
+            logger.error(f"Error in user callback: {e}")
+
+    def _track_entry(self, dest_cid: bytes, entry: ConnEntry) -> None:
+        """Add an entry to the connection table."""
+        self._conns[dest_cid] = entry
+        if entry.state == ConnEntry.STATE_PENDING:
+            self._pending_count += 1
+
+    def _untrack_entry(self, dest_cid: bytes) -> ConnEntry | None:
+        """Remove and return an entry from the connection table."""
+        entry = self._conns.pop(dest_cid, None)
+        if entry and entry.state == ConnEntry.STATE_PENDING:
+            self._pending_count -= 1
+        return entry
+
+    def _mark_established(self, entry: ConnEntry, connection: QUICConnection) -> None:
+        """Promote a pending entry to an established connection."""
+        if entry.state == ConnEntry.STATE_PENDING:
+            self._pending_count -= 1
+        entry.connection = connection
+        entry.state = ConnEntry.STATE_ESTABLISHED
+
+    async def _remove_connection(self, dest_cid: bytes) -> None:
+        """Remove connection by connection ID."""
+        entry = self._untrack_entry(dest_cid)
+        if entry:
+            await self._close_removed_entry(entry)
 
-    async def _remove_pending_connection(self, dest_cid: bytes) -> None:
-        """Remove pending connection by connection ID."""
+    async def _close_removed_entry(self, entry: ConnEntry) -> None:
+        """Clean up after a connection entry already popped from the table."""
         try:
-            self._pending_connections.pop(dest_cid, None)
-            addr = self._cid_to_addr.pop(dest_cid, None)
-            if addr:
-                self._addr_to_cid.pop(addr, None)
-            logger.debug(f"Removed pending connection {dest_cid.hex()}")
+            self._addr_to_cid.pop(entry.addr, None)
+            if entry.connection:
+                await entry.connection.close()
+            logger.debug("Removed connection %s", entry.cid_hex)
+
         except Exception as e:
-            logger.error(f"Error removing pending connection {dest_cid.hex()}: {e}")
+            logger.error(f"Error removing connection {entry.cid_hex}: {e}")
 
     async def _remove_connection_by_addr(self, addr: tuple[str, int]) -> None:
         """Remove connection by address (fallback method)."""
@@ -776,75 +916,75 @@ class QUICListener(IListener):
             await self._remove_connection(dest_cid)
 
     async def _transmit_for_connection(
-        self, quic_conn: QuicConnection, addr: tuple[str, int]
+        self, quic_conn: QuicConnection, addr: tuple[str, int], now: float
     ) -> None:
-        """Enhanced transmission diagnostics to analyze datagram content."""
+        """Send pending datagrams, analyzing their content under DEBUG logging."""
         try:
-            logger.debug(f" TRANSMIT: Starting transmission to {addr}")
-
-            # Get current timestamp for timing
-            import time
-
-            now = time.time()
-
             datagrams = quic_conn.datagrams_to_send(now=now)
-            logger.debug(f" TRANSMIT: Got {len(datagrams)} datagrams to send")
+
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_transmit_diagnostics(datagrams, addr)
 
             if not datagrams:
-                logger.debug("⚠️  TRANSMIT: No datagrams to send")
                 return
 
-            for i, (datagram, dest_addr) in enumerate(datagrams):
-                logger.debug(f" TRANSMIT: Analyzing datagram {i}")
-                logger.debug(f" TRANSMIT: Datagram size: {len(datagram)} bytes")
-                logger.debug(f" TRANSMIT: Destination: {dest_addr}")
-                logger.debug(f" TRANSMIT: Expected destination: {addr}")
-
-                # Analyze datagram content
-                if len(datagram) > 0:
-                    # QUIC packet format analysis
-                    first_byte = datagram[0]
-                    header_form = (first_byte & 0x80) >> 7  # Bit 7
-
-                    # For long header packets (handshake), analyze further
-                    if header_form == 1:  # Long header
-                        # CRYPTO frame type is 0x06
-                        crypto_frame_found = False
-                        for offset in range(len(datagram)):
-                            if datagram[offset] == 0x06:
-                                crypto_frame_found = True
-                                break
-
-                        if not crypto_frame_found:
-                            logger.error("No CRYPTO frame found in datagram!")
-                            # Look for other frame types
-                            frame_types_found = set()
-                            for offset in range(len(datagram)):
-                                frame_type = datagram[offset]
-                                if frame_type in [0x00, 0x01]:  # PADDING/PING
-                                    frame_types_found.add("PADDING/PING")
-                                elif frame_type == 0x02:  # ACK
-                                    frame_types_found.add("ACK")
-                                elif frame_type == 0x06:  # CRYPTO
-                                    frame_types_found.add("CRYPTO")
-
-                if self._socket:
-                    try:
-                        await self._socket.sendto(datagram, addr)
-                    except Exception as send_error:
-                        logger.error(f"Socket send failed: {send_error}")
-                else:
-                    logger.error("No socket available!")
-        except Exception as e:
-            logger.debug(f"Transmission error: {e}")
+            if self._socket:
+                try:
+                    # Ship the whole burst (e.g. coalesced Initial + Handshake)
+                    # in as few syscalls as the platform allows
+                    await send_datagrams(
+                        self._socket, [(datagram, addr) for datagram, _ in datagrams]
+                    )
+                except (OSError, trio.ClosedResourceError) as send_error:
+                    logger.error("Socket send failed: %s", send_error)
+            else:
+                logger.error("No socket available!")
+        except QuicConnectionError as e:
+            logger.debug("Transmission error: %s", e)
+
+    def _log_transmit_diagnostics(
+        self, datagrams: list[tuple[bytes, Any]], addr: tuple[str, int]
+    ) -> None:
+        """Log the size, destination and frame types of outgoing datagrams."""
+        logger.debug(" TRANSMIT: Starting transmission to %s", addr)
+        logger.debug(" TRANSMIT: Got %s datagrams to send", len(datagrams))
+
+        if not datagrams:
+            logger.debug("⚠️  TRANSMIT: No datagrams to send")
+            return
+
+        for i, (datagram, dest_addr) in enumerate(datagrams):
+            logger.debug(" TRANSMIT: Analyzing datagram %s", i)
+            logger.debug(" TRANSMIT: Datagram size: %s bytes", len(datagram))
+            logger.debug(" TRANSMIT: Destination: %s", dest_addr)
+            logger.debug(" TRANSMIT: Expected destination: %s", addr)
+
+            # For long header packets (handshake), analyze further
+            if datagram and datagram[0] & 0x80:
+                # CRYPTO frame type is 0x06
+                if 0x06 not in datagram:
+                    # Look for other frame types
+                    # Per-type byte searches run in C and stop at the first
+                    # hit, rather than building a set of every byte value
+                    frame_types_found = {
+                        label
+                        for frame_type, label in _FRAME_TYPE_LABELS.items()
+                        if frame_type in datagram
+                    }
+                    logger.debug(
+                        "No CRYPTO frame found in datagram! Frame types: %s",
+                        sorted(frame_types_found),
+                    )
 
     async def listen(self, maddr: Multiaddr, nursery: trio.Nursery) -> bool:
         """Start listening on the given multiaddr with enhanced connection handling."""
         if self._listening:
             raise QUICListenError("Already listening")
 
-        if not is_quic_multiaddr(maddr):
-            raise QUICListenError(f"Invalid QUIC multiaddr: {maddr}")
+        try:
+            host, port, quic_version = parse_quic_multiaddr(maddr)
+        except QUICInvalidMultiaddrError as e:
+            raise QUICListenError(f"Invalid QUIC multiaddr: {maddr}") from e
 
         if self._transport._background_nursery:
             active_nursery = self._transport._background_nursery
@@ -857,25 +997,27 @@ class QUICListener(IListener):
             raise QUICListenError("No nursery available")
 
         try:
-            host, port = quic_multiaddr_to_endpoint(maddr)
-
             # Create and configure socket
             self._socket = await self._create_socket(host, port)
             self._nursery = active_nursery
 
             # Get the actual bound address
             bound_host, bound_port = self._socket.getsockname()
-            quic_version = multiaddr_to_quic_version(maddr)
             bound_maddr = create_quic_multiaddr(bound_host, bound_port, quic_version)
             self._bound_addresses = [bound_maddr]
 
             self._listening = True
 
-            # Start packet handling loop
+            # Start packet handling loop and the slow-path workers it feeds
             active_nursery.start_soon(self._handle_incoming_packets)
+            for _ in range(_PACKET_WORKERS):
+                active_nursery.start_soon(
+                    self._packet_worker, self._packet_receive.clone()
+                )
+            self._packet_receive.close()
 
             logger.info(
-                f"QUIC listener started on {bound_maddr} with connection ID support"
+                "QUIC listener started on %s with connection ID support", bound_maddr
             )
             return True
 
@@ -886,14 +1028,9 @@ class QUICListener(IListener):
     async def _create_socket(self, host: str, port: int) -> trio.socket.SocketType:
         """Create and configure UDP socket."""
         try:
-            # Determine address family
-            try:
-                import ipaddress
-
-                ip = ipaddress.ip_address(host)
-                family = socket.AF_INET if ip.version == 4 else socket.AF_INET6
-            except ValueError:
-                family = socket.AF_INET
+            # Determine address family; only IPv6 literals contain a colon
+            host = host.strip("[]")
+            family = socket.AF_INET6 if ":" in host else socket.AF_INET
 
             # Create UDP socket
             sock = trio.socket.socket(family=family, type=socket.SOCK_DGRAM)
@@ -902,29 +1039,45 @@ class QUICListener(IListener):
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             if hasattr(socket, "SO_REUSEPORT"):
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)  # type: ignore[attr-defined]
+            set_socket_buffer_sizes(
+                sock,
+                self._config.socket_receive_buffer,
+                self._config.socket_send_buffer,
+            )
 
             # Bind to address
             await sock.bind((host, port))
 
-            logger.debug(f"Created and bound UDP socket to {host}:{port}")
+            logger.debug("Created and bound UDP socket to %s:%s", host, port)
             return sock
 
-        except Exception as e:
+        except OSError as e:
             raise QUICListenError(f"Failed to create socket: {e}") from e
 
     async def _handle_incoming_packets(self) -> None:
         """Handle incoming UDP packets with enhanced routing."""
         logger.debug("Started enhanced packet handling loop")
 
+        if not self._socket:
+            return
+        # Dequeues every waiting datagram per syscall into reused buffers,
+        # with the kernel coalescing bursts from the same peer where it can
+        receiver = DatagramReceiver(self._socket, gro=True)
+
         try:
             while self._listening and self._socket:
                 try:
-                    # Receive UDP packet
-                    data, addr = await self._socket.recvfrom(65536)
-
-                    # Process packet asynchronously
-                    if self._nursery:
-                        self._nursery.start_soon(self._process_packet, data, addr)
+                    for data, addr in await receiver.receive():
+                        # Packets for established connections are handled
+                        # inline; only handshakes and anything else needing
+                        # the slow path get a task of their own
+                        connection = self._short_header_connection(data, addr)
+                        if connection is not None:
+                            await self._process_short_header_packet(
+                                connection, data, addr
+                            )
+                        else:
+                            await self._packet_send.send((data, addr))
 
                 except trio.ClosedResourceError:
                     logger.debug("Socket closed, exiting packet handler")
@@ -938,6 +1091,18 @@ class QUICListener(IListener):
         finally:
             logger.debug("Enhanced packet handling loop terminated")
 
+    async def _packet_worker(
+        self, packets: trio.MemoryReceiveChannel[tuple[bytes, tuple[str, int]]]
+    ) -> None:
+        """Process queued slow-path packets until the listener closes."""
+        async with packets:
+            async for data, addr in packets:
+                # Drop whatever is still queued once close() has emptied the
+                # connection table, rather than accepting new connections
+                if self._closed:
+                    break
+                await self._process_packet(data, addr)
+
     async def close(self) -> None:
         """Close the listener and clean up resources."""
         if self._closed:
@@ -945,15 +1110,15 @@ class QUICListener(IListener):
 
         self._closed = True
         self._listening = False
+        self._packet_send.close()
 
         try:
             # Close all connections
             async with self._connection_lock:
-                for dest_cid in list(self._connections.keys()):
-                    await self._remove_connection(dest_cid)
-
-                for dest_cid in list(self._pending_connections.keys()):
-                    await self._remove_pending_connection(dest_cid)
+                while self._conns:
+                    _, entry = self._conns.popitem()
+                    await self._close_removed_entry(entry)
+                self._pending_count = 0
 
             # Close socket
             if self._socket:
@@ -964,24 +1129,26 @@ class QUICListener(IListener):
 
             logger.info("QUIC listener closed")
 
-        except Exception as e:
-            logger.error(f"Error closing listener: {e}")
+        except OSError as e:
+            logger.error("Error closing listener: %s", e)
 
     async def _remove_connection_by_object(
         self, connection_obj: QUICConnection
     ) -> None:
         """Remove a connection by object reference."""
         try:
-            # Find the connection ID for this object
-            connection_cid = None
-            for cid, tracked_connection in self._connections.items():
-                if tracked_connection is connection_obj:
-                    connection_cid = cid
-                    break
+            # Find the connection ID for this object, by address first
+            connection_cid = self._addr_to_cid.get(connection_obj._remote_addr)
+            entry = self._conns.get(connection_cid) if connection_cid else None
+            if entry is None or entry.connection is not connection_obj:
+                connection_cid = None
+                for cid, entry in self._conns.items():
+                    if entry.connection is connection_obj:
+                        connection_cid = cid
+                        break
 
             if connection_cid:
                 await self._remove_connection(connection_cid)
-                logger.debug(f"Removed connection {connection_cid.hex()}")
             else:
                 logger.warning("Connection object not found in tracking")
 
@@ -998,7 +1165,7 @@ class QUICListener(IListener):
         """Handle newly established connection by adding to swarm."""
         try:
             logger.debug(
-                f"New QUIC connection established from {connection._remote_addr}"
+                "New QUIC connection established from %s", connection._remote_addr
             )
 
             if self._transport._swarm:
@@ -1013,8 +1180,8 @@ class QUICListener(IListener):
             logger.error(f"Error adding QUIC connection to swarm: {e}")
             await connection.close()
 
-    def get_addrs(self) -> tuple[Multiaddr]:
-        return tuple(self.get_addresses())
+    def get_addrs(self) -> tuple[Multiaddr, ...]:
+        return tuple(self._bound_addresses)
 
     def is_listening(self) -> bool:
         """
@@ -1034,8 +1201,9 @@ class QUICListener(IListener):
             dict: Statistics dictionary with current state information
 
         """
-        stats = self._stats.copy()
-        stats["is_listening"] = self.is_listening()
-        stats["active_connections"] = len(self._connections)
-        stats["pending_connections"] = len(self._pending_connections)
-        return stats
+        return {
+            **self._stats,
+            "is_listening": self._listening and not self._closed,
+            "active_connections": len(self._conns) - self._pending_count,
+            "pending_connections": self._pending_count,
+        }
@@ -33,8 +33,7 @@ from libp2p.transport.quic.utils import (
     create_server_config_from_base,
     get_alpn_protocols,
     is_quic_multiaddr,
-    multiaddr_to_quic_version,
-    quic_multiaddr_to_endpoint,
+    parse_quic_multiaddr,
     quic_version_to_wire_format,
 )
 
@@ -51,6 +50,7 @@ from .connection import (
 )
 from .exceptions import (
     QUICDialError,
+    QUICInvalidMultiaddrError,
     QUICListenError,
     QUICSecurityError,
 )
@@ -246,12 +246,13 @@ class QUICTransport(ITransport):
         if self._closed:
             raise QUICDialError("Transport is closed")
 
-        if not is_quic_multiaddr(maddr):
-            raise QUICDialError(f"Invalid QUIC multiaddr: {maddr}")
+        try:
+            host, port, quic_version = parse_quic_multiaddr(maddr)
+        except QUICInvalidMultiaddrError as e:
+            raise QUICDialError(f"Invalid QUIC multiaddr: {maddr}") from e
 
         try:
             # Extract connection details from multiaddr
-            host, port = quic_multiaddr_to_endpoint(maddr)
             remote_peer_id = maddr.get_peer_id()
             if remote_peer_id is not None:
                 remote_peer_id = ID.from_base58(remote_peer_id)
@@ -259,7 +260,6 @@ class QUICTransport(ITransport):
             if remote_peer_id is None:
                 logger.error("Unable to derive peer id from multiaddr")
                 raise QUICDialError("Unable to derive peer id from multiaddr")
-            quic_version = multiaddr_to_quic_version(maddr)
 
             # Get appropriate QUIC client configuration
             config_key = TProtocol(f"{quic_version}_client")
@@ -0,0 +1,553 @@
+"""
+UDP socket helpers for QUIC transport.
+Batches outgoing datagrams into a single UDP GSO send or sendmmsg(2) call,
+and incoming datagrams into a single recvmmsg(2) call with optional UDP GRO,
+where available.
+"""
+
+from collections.abc import Sequence
+import ctypes
+import errno
+import logging
+import os
+import socket
+import struct
+import sys
+from typing import Any
+
+import trio
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on messages handed to the kernel in one sendmmsg call (UIO_MAXIOV)
+SENDMMSG_MAX_BATCH = 1024
+
+# Size of each receive buffer, large enough for any UDP payload. We don't
+# advertise max_udp_payload_size, so peers may legitimately send datagrams
+# beyond our own max_datagram_size (e.g. PMTU probes on jumbo-frame links),
+# and with GRO one receive can hold a whole coalesced burst.
+RECV_BUFFER_SIZE = 65536
+
+# Datagrams dequeued per recvmmsg call; kept small as every buffer is full-size
+RECVMMSG_BATCH = 16
+
+# Room for any socket address the kernel returns (sizeof(struct sockaddr_storage))
+_SOCKADDR_STORAGE_SIZE = 128
+
+# Linux UDP generic segmentation and receive offload (linux/udp.h), absent
+# from older Pythons
+UDP_SEGMENT = getattr(socket, "UDP_SEGMENT", 103)
+UDP_GRO = getattr(socket, "UDP_GRO", 104)
+
+# Control messages are word-aligned headers followed by their payload
+_CMSG_HEADER = struct.Struct("@Nii")
+_GRO_CONTROL_SIZE = 64
+
+# Kernel limits for one GSO send (UDP_MAX_SEGMENTS, and an IP packet's payload)
+GSO_MAX_SEGMENTS = 64
+GSO_MAX_BYTES = 65000
+
+# Errors raised when the kernel or the outgoing device can't segment for us
+_GSO_UNSUPPORTED_ERRNOS = frozenset(
+    {errno.EINVAL, errno.EIO, errno.ENOPROTOOPT, errno.EOPNOTSUPP}
+)
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_libc_function(name: str, argtypes: list[Any]) -> Any:
+    """Bind a libc function, or return None when the platform lacks it."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        func = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = argtypes
+    func.restype = ctypes.c_int
+    return func
+
+
+_sendmmsg = _load_libc_function(
+    "sendmmsg",
+    [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int],
+)
+_recvmmsg = _load_libc_function(
+    "recvmmsg",
+    [
+        ctypes.c_int,
+        ctypes.POINTER(_MMsgHdr),
+        ctypes.c_uint,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    ],
+)
+
+# Cleared the first time a GSO send is rejected, so later bursts skip it
+_gso_enabled = sys.platform.startswith("linux")
+
+
+def _encode_sockaddr(family: int, addr: tuple[Any, ...]) -> bytes:
+    """
+    Encode a numeric Python socket address tuple as a C sockaddr structure.
+
+    Raises:
+        ValueError: If the address can't be encoded without name resolution
+
+    """
+    host, port = addr[0], addr[1]
+    try:
+        if family == socket.AF_INET:
+            return (
+                struct.pack("=H", socket.AF_INET)
+                + struct.pack("!H", port)
+                + socket.inet_pton(socket.AF_INET, host)
+                + bytes(8)
+            )
+        if family == socket.AF_INET6:
+            if ":" not in host:
+                # IPv4 peer reached through a dual-stack socket
+                host = f"::ffff:{host}"
+            flowinfo = addr[2] if len(addr) > 2 else 0
+            scope_id = addr[3] if len(addr) > 3 else 0
+            return (
+                struct.pack("=H", socket.AF_INET6)
+                + struct.pack("!HI", port, flowinfo)
+                + socket.inet_pton(socket.AF_INET6, host)
+                + struct.pack("=I", scope_id)
+            )
+    except (OSError, TypeError, struct.error) as e:
+        raise ValueError(f"Cannot encode socket address {addr}: {e}") from e
+    raise ValueError(f"Unsupported address family: {family}")
+
+
+def _decode_sockaddr(raw: bytes) -> tuple[Any, ...]:
+    """
+    Decode a C sockaddr structure into a Python socket address tuple.
+
+    The result matches what ``recvfrom`` returns for the same peer.
+
+    Raises:
+        ValueError: If the address family is not IPv4 or IPv6
+
+    """
+    (family,) = struct.unpack_from("=H", raw)
+    if family == socket.AF_INET:
+        (port,) = struct.unpack_from("!H", raw, 2)
+        return socket.inet_ntop(socket.AF_INET, raw[4:8]), port
+    if family == socket.AF_INET6:
+        port, flowinfo = struct.unpack_from("!HI", raw, 2)
+        (scope_id,) = struct.unpack_from("=I", raw, 24)
+        return socket.inet_ntop(socket.AF_INET6, raw[8:24]), port, flowinfo, scope_id
+    raise ValueError(f"Unsupported address family: {family}")
+
+
+def _gro_segment_size(control: bytes) -> int | None:
+    """
+    Find the UDP_GRO segment size in a raw control message buffer.
+
+    Returns:
+        Size of the coalesced datagrams, or None if the kernel didn't coalesce
+
+    """
+    offset = 0
+    while offset + _CMSG_HEADER.size <= len(control):
+        length, level, kind = _CMSG_HEADER.unpack_from(control, offset)
+        if length < _CMSG_HEADER.size:
+            break
+        if level == socket.IPPROTO_UDP and kind == UDP_GRO:
+            (segment_size,) = struct.unpack_from(
+                "=i", control, offset + socket.CMSG_LEN(0)
+            )
+            return segment_size
+        offset += socket.CMSG_SPACE(length - socket.CMSG_LEN(0))
+    return None
+
+
+def _split_segments(
+    data: bytes, addr: tuple[Any, ...], segment_size: int | None
+) -> list[tuple[bytes, tuple[Any, ...]]]:
+    """Split a GRO-coalesced receive back into the datagrams the peer sent."""
+    if not segment_size or segment_size >= len(data):
+        return [(data, addr)]
+    return [
+        (data[i : i + segment_size], addr) for i in range(0, len(data), segment_size)
+    ]
+
+
+def _enable_gro(sock: trio.socket.SocketType) -> bool:
+    """Ask the kernel to coalesce received datagrams, returning success."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_UDP, UDP_GRO, 1)
+    except OSError as e:
+        logger.debug("UDP GRO unavailable: %s", e)
+        return False
+    return True
+
+
+def _sendmmsg_nowait(
+    fd: int, family: int, datagrams: Sequence[tuple[bytes, tuple[Any, ...]]]
+) -> int:
+    """
+    Send datagrams with one non-blocking sendmmsg call.
+
+    Returns:
+        Number of datagrams accepted by the kernel
+
+    Raises:
+        ValueError: If a destination address is not a numeric IP address
+        BlockingIOError: If the socket send buffer is full
+        OSError: On any other send failure
+
+    """
+    count = len(datagrams)
+    msgs = (_MMsgHdr * count)()
+    iovecs = (_IOVec * count)()
+    # Keep every buffer referenced by the C structures alive for the call
+    keepalive: list[Any] = []
+    names: dict[tuple[Any, ...], Any] = {}
+
+    for i, (data, addr) in enumerate(datagrams):
+        name = names.get(addr)
+        if name is None:
+            raw = _encode_sockaddr(family, addr)
+            name = names[addr] = ctypes.create_string_buffer(raw, len(raw))
+        buf = ctypes.c_char_p(bytes(data))
+        keepalive.append(buf)
+
+        iovecs[i].iov_base = ctypes.cast(buf, ctypes.c_void_p)
+        iovecs[i].iov_len = len(data)
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = ctypes.cast(name, ctypes.c_void_p)
+        hdr.msg_namelen = len(name)
+        hdr.msg_iov = ctypes.pointer(iovecs[i])
+        hdr.msg_iovlen = 1
+
+    sent = _sendmmsg(fd, msgs, count, socket.MSG_DONTWAIT)
+    if sent < 0:
+        err = ctypes.get_errno()
+        if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+            raise BlockingIOError(err, os.strerror(err))
+        raise OSError(err, os.strerror(err))
+    return sent
+
+
+def set_socket_buffer_sizes(
+    sock: trio.socket.SocketType, receive: int | None, send: int | None
+) -> None:
+    """
+    Size a UDP socket's kernel buffers so bursts aren't dropped.
+
+    The privileged ``SO_RCVBUFFORCE``/``SO_SNDBUFFORCE`` options are tried
+    first, since they may exceed the system-wide maximum; without the needed
+    capability the regular, capped options are used instead. A size of None
+    leaves that buffer at the OS default.
+    """
+    for size, force_name, option in (
+        (receive, "SO_RCVBUFFORCE", socket.SO_RCVBUF),
+        (send, "SO_SNDBUFFORCE", socket.SO_SNDBUF),
+    ):
+        if size is None:
+            continue
+        force = getattr(socket, force_name, None)
+        try:
+            if force is not None:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, force, size)
+                    continue
+                except PermissionError:
+                    pass
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+        except OSError as e:
+            logger.debug("Could not set UDP socket buffer size to %s: %s", size, e)
+
+
+def _gso_batches(
+    datagrams: Sequence[tuple[bytes, tuple[Any, ...]]],
+) -> list[tuple[int, int, bytes]] | None:
+    """
+    Split a burst into GSO sends, or return None if it can't be segmented.
+
+    GSO needs every datagram to go to the same address and all but the last to
+    share one size; the last may be shorter.
+
+    Returns:
+        ``(first_index, segment_size, buffer)`` for each GSO send
+
+    """
+    addr = datagrams[0][1]
+    segment_size = len(datagrams[0][0])
+    if segment_size == 0:
+        return None
+    for i, (data, dest) in enumerate(datagrams):
+        if dest != addr or len(data) > segment_size:
+            return None
+        if len(data) < segment_size and i != len(datagrams) - 1:
+            return None
+
+    per_send = min(GSO_MAX_SEGMENTS, GSO_MAX_BYTES // segment_size)
+    if per_send < 2:
+        return None
+    return [
+        (
+            start,
+            segment_size,
+            b"".join(data for data, _ in datagrams[start : start + per_send]),
+        )
+        for start in range(0, len(datagrams), per_send)
+    ]
+
+
+async def _send_gso(
+    sock: trio.socket.SocketType,
+    datagrams: Sequence[tuple[bytes, tuple[Any, ...]]],
+) -> int:
+    """
+    Send a burst with UDP GSO, letting the kernel split it into datagrams.
+
+    Returns:
+        Number of leading datagrams sent; the caller sends the rest
+
+    """
+    global _gso_enabled
+
+    batches = _gso_batches(datagrams)
+    if batches is None:
+        return 0
+
+    addr = datagrams[0][1]
+    for start, segment_size, buffer in batches:
+        try:
+            await sock.sendmsg(
+                [buffer],
+                [(socket.IPPROTO_UDP, UDP_SEGMENT, struct.pack("=H", segment_size))],
+                0,
+                addr,
+            )
+        except OSError as e:
+            if e.errno not in _GSO_UNSUPPORTED_ERRNOS:
+                raise
+            logger.debug("UDP GSO unavailable, disabling it: %s", e)
+            _gso_enabled = False
+            return start
+    return len(datagrams)
+
+
+async def send_datagrams(
+    sock: trio.socket.SocketType,
+    datagrams: Sequence[tuple[bytes, tuple[Any, ...]]],
+) -> None:
+    """
+    Send a burst of UDP datagrams on a trio socket.
+
+    A single datagram goes through ``sendto`` directly. On Linux, a burst of
+    equal-sized datagrams to one address is sent as a single UDP GSO buffer
+    that the kernel segments, and any other burst is handed over with one
+    ``sendmmsg`` call, so an N-datagram burst costs one syscall instead of N.
+    Other platforms, and destinations that are not numeric addresses, fall
+    back to one ``sendto`` per datagram.
+
+    Args:
+        sock: Bound trio UDP socket
+        datagrams: ``(payload, address)`` pairs as returned by aioquic's
+            ``datagrams_to_send``
+
+    """
+    if len(datagrams) == 1:
+        data, addr = datagrams[0]
+        await sock.sendto(data, addr)
+        return
+
+    if _gso_enabled and len(datagrams) > 1:
+        sent = await _send_gso(sock, datagrams)
+        if sent == len(datagrams):
+            return
+        datagrams = datagrams[sent:]
+
+    if _sendmmsg is None or len(datagrams) <= 1:
+        for data, addr in datagrams:
+            await sock.sendto(data, addr)
+        return
+
+    await trio.lowlevel.checkpoint_if_cancelled()
+    fd = sock.fileno()
+    remaining = datagrams
+    blocked = False
+    while remaining:
+        if blocked:
+            await trio.lowlevel.wait_writable(fd)
+        try:
+            sent = _sendmmsg_nowait(fd, sock.family, remaining[:SENDMMSG_MAX_BATCH])
+        except BlockingIOError:
+            blocked = True
+            continue
+        except ValueError:
+            for data, addr in remaining:
+                await sock.sendto(data, addr)
+            return
+        remaining = remaining[sent:]
+        blocked = sent == 0
+
+    await trio.lowlevel.cancel_shielded_checkpoint()
+
+
+class DatagramReceiver:
+    """
+    Receive bursts of UDP datagrams from a trio socket.
+
+    On Linux, everything queued on the socket (up to ``RECVMMSG_BATCH``
+    datagrams) is dequeued with a single ``recvmmsg`` call into a ring of
+    preallocated buffers. Other platforms receive one datagram per call into
+    a reused buffer.
+
+    With ``gro`` set, UDP receive offload is enabled where the kernel
+    supports it: consecutive datagrams from one peer arrive coalesced in a
+    single buffer and are split back apart by segment size.
+    """
+
+    def __init__(
+        self,
+        sock: trio.socket.SocketType,
+        batch_size: int = RECVMMSG_BATCH,
+        buffer_size: int = RECV_BUFFER_SIZE,
+        gro: bool = False,
+    ) -> None:
+        self._sock = sock
+        self._gro = gro and _enable_gro(sock)
+        if self._gro:
+            buffer_size = RECV_BUFFER_SIZE
+        self._batch_size = batch_size
+
+        if _recvmmsg is None:
+            self._buffer = bytearray(RECV_BUFFER_SIZE)
+            self._view = memoryview(self._buffer)
+            return
+
+        self._controls = [
+            ctypes.create_string_buffer(_GRO_CONTROL_SIZE if self._gro else 0)
+            for _ in range(batch_size)
+        ]
+        self._msgs = (_MMsgHdr * batch_size)()
+        self._iovecs = (_IOVec * batch_size)()
+        self._buffers = [
+            ctypes.create_string_buffer(buffer_size) for _ in range(batch_size)
+        ]
+        self._names = [
+            ctypes.create_string_buffer(_SOCKADDR_STORAGE_SIZE)
+            for _ in range(batch_size)
+        ]
+        for i in range(batch_size):
+            self._iovecs[i].iov_base = ctypes.cast(self._buffers[i], ctypes.c_void_p)
+            self._iovecs[i].iov_len = buffer_size
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_name = ctypes.cast(self._names[i], ctypes.c_void_p)
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+            if self._gro:
+                hdr.msg_control = ctypes.cast(self._controls[i], ctypes.c_void_p)
+
+    def _recvmmsg_nowait(self) -> list[tuple[bytes, tuple[Any, ...]]]:
+        """
+        Dequeue every waiting datagram with one non-blocking recvmmsg call.
+
+        Raises:
+            BlockingIOError: If no datagram is waiting
+            trio.ClosedResourceError: If the socket has been closed
+            OSError: On any other receive failure
+
+        """
+        for i in range(self._batch_size):
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_namelen = _SOCKADDR_STORAGE_SIZE
+            hdr.msg_flags = 0
+            if self._gro:
+                hdr.msg_controllen = _GRO_CONTROL_SIZE
+
+        fd = self._sock.fileno()
+        if fd == -1:
+            raise trio.ClosedResourceError("socket was already closed")
+
+        count = _recvmmsg(fd, self._msgs, self._batch_size, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise BlockingIOError(err, os.strerror(err))
+            raise OSError(err, os.strerror(err))
+
+        datagrams = []
+        for i in range(count):
+            msg = self._msgs[i]
+            hdr = msg.msg_hdr
+            if hdr.msg_flags & socket.MSG_TRUNC:
+                logger.debug("Dropping datagram larger than the receive buffer")
+                continue
+            addr = _decode_sockaddr(ctypes.string_at(self._names[i], hdr.msg_namelen))
+            data = ctypes.string_at(self._buffers[i], msg.msg_len)
+            if self._gro:
+                control = ctypes.string_at(self._controls[i], hdr.msg_controllen)
+                datagrams.extend(
+                    _split_segments(data, addr, _gro_segment_size(control))
+                )
+            else:
+                datagrams.append((data, addr))
+        return datagrams
+
+    async def receive(self) -> list[tuple[bytes, tuple[Any, ...]]]:
+        """
+        Wait for datagrams and return every one that is ready.
+
+        Returns:
+            ``(payload, address)`` pairs, with address tuples as returned by
+            ``recvfrom``; may be empty if only oversized datagrams arrived
+
+        """
+        if _recvmmsg is None:
+            if self._gro:
+                data, ancdata, _, addr = await self._sock.recvmsg(
+                    RECV_BUFFER_SIZE, socket.CMSG_SPACE(4)
+                )
+                segment_size = next(
+                    (
+                        int.from_bytes(cmsg_data[:4], sys.byteorder)
+                        for level, kind, cmsg_data in ancdata
+                        if level == socket.IPPROTO_UDP and kind == UDP_GRO
+                    ),
+                    None,
+                )
+                return _split_segments(data, addr, segment_size)
+
+            nbytes, addr = await self._sock.recvfrom_into(self._buffer)
+            return [(bytes(self._view[:nbytes]), addr)]
+
+        await trio.lowlevel.checkpoint_if_cancelled()
+        while True:
+            try:
+                datagrams = self._recvmmsg_nowait()
+            except BlockingIOError:
+                await trio.lowlevel.wait_readable(self._sock.fileno())
+                continue
+            break
+
+        await trio.lowlevel.cancel_shielded_checkpoint()
+        return datagrams
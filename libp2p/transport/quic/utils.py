@@ -4,6 +4,7 @@ Essential utilities required for QUIC transport implementation.
 Based on go-libp2p and js-libp2p QUIC implementations.
 """
 
+import functools
 import ipaddress
 import logging
 import ssl
@@ -166,6 +167,49 @@ def multiaddr_to_quic_version(maddr: multiaddr.Multiaddr) -> TProtocol:
         ) from e
 
 
+@functools.lru_cache(maxsize=1024)
+def parse_quic_multiaddr(maddr: multiaddr.Multiaddr) -> tuple[str, int, TProtocol]:
+    """
+    Extract host, port and QUIC version from a QUIC multiaddr in one pass.
+
+    Results are cached, since the same addresses are parsed on every listen
+    and dial.
+
+    Args:
+        maddr: QUIC multiaddr
+
+    Returns:
+        Tuple of (host, port, version)
+
+    Raises:
+        QUICInvalidMultiaddrError: If multiaddr is not a valid QUIC address
+
+    """
+    host: str | None = None
+    port: int | None = None
+    version: TProtocol | None = None
+
+    try:
+        for protocol, value in maddr.items():
+            name = protocol.name
+            if name in (IP4_PROTOCOL, IP6_PROTOCOL):
+                host = host or value
+            elif name == UDP_PROTOCOL:
+                port = int(value) if port is None else port
+            elif name in (QUIC_V1_PROTOCOL, QUIC_DRAFT29_PROTOCOL):
+                version = TProtocol(name)
+                break
+    except Exception as e:
+        raise QUICInvalidMultiaddrError(
+            f"Failed to parse QUIC multiaddr {maddr}: {e}"
+        ) from e
+
+    if host is None or port is None or version is None:
+        raise QUICInvalidMultiaddrError(f"Not a valid QUIC multiaddr: {maddr}")
+
+    return host, port, version
+
+
 def create_quic_multiaddr(
     host: str, port: int, version: str = "quic-v1"
 ) -> multiaddr.Multiaddr:
@@ -282,11 +326,7 @@ def normalize_quic_multiaddr(maddr: multiaddr.Multiaddr) -> multiaddr.Multiaddr:
         QUICInvalidMultiaddrError: If not a valid QUIC multiaddr
 
     """
-    if not is_quic_multiaddr(maddr):
-        raise QUICInvalidMultiaddrError(f"Not a QUIC multiaddr: {maddr}")
-
-    host, port = quic_multiaddr_to_endpoint(maddr)
-    version = multiaddr_to_quic_version(maddr)
+    host, port, version = parse_quic_multiaddr(maddr)
 
     return create_quic_multiaddr(host, port, version)
 
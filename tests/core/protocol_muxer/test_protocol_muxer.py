@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import pytest
 
 from libp2p.custom_types import (
@@ -18,78 +20,81 @@ PROTOCOL_ROCK = TProtocol("/rock/1.0.0")
 
 ACK_PREFIX = "ack:"
 
+MESSAGES = [f"hello{x}".encode() for x in range(10)]
+EXPECTED_RESPONSES = [ACK_PREFIX.encode() + message for message in MESSAGES]
 
-async def perform_simple_test(
-    expected_selected_protocol,
-    protocols_for_client,
-    protocols_with_handlers,
-    security_protocol,
-):
+
+@asynccontextmanager
+async def connected_hosts(security_protocol):
     async with HostFactory.create_batch_and_listen(
         2, security_protocol=security_protocol
     ) as hosts:
-        for protocol in protocols_with_handlers:
-            hosts[1].set_stream_handler(
-                protocol, create_echo_stream_handler(ACK_PREFIX)
-            )
-
         # Associate the peer with local ip address (see default parameters of Libp2p())
         hosts[0].get_peerstore().add_addrs(hosts[1].get_id(), hosts[1].get_addrs(), 10)
-        stream = await hosts[0].new_stream(hosts[1].get_id(), protocols_for_client)
-        messages = ["hello" + str(x) for x in range(10)]
-        for message in messages:
-            expected_resp = "ack:" + message
-            await stream.write(message.encode())
-            response = (await stream.read(len(expected_resp))).decode()
-            assert response == expected_resp
+        yield hosts
 
-        assert expected_selected_protocol == stream.get_protocol()
 
+@pytest.fixture
+async def hosts_pair(security_protocol):
+    async with connected_hosts(security_protocol) as hosts:
+        yield hosts
 
-@pytest.mark.trio
-async def test_single_protocol_succeeds(security_protocol):
-    expected_selected_protocol = PROTOCOL_ECHO
-    await perform_simple_test(
-        expected_selected_protocol,
-        [expected_selected_protocol],
-        [expected_selected_protocol],
-        security_protocol,
-    )
 
+async def perform_simple_test(
+    hosts,
+    expected_selected_protocol,
+    protocols_for_client,
+    protocols_with_handlers,
+):
+    for protocol in protocols_with_handlers:
+        hosts[1].set_stream_handler(protocol, create_echo_stream_handler(ACK_PREFIX))
 
-@pytest.mark.trio
-async def test_single_protocol_fails(security_protocol):
-    # Expect that protocol negotiation fails when no common protocols exist
-    with pytest.raises(Exception):
-        await perform_simple_test(
-            "", [PROTOCOL_ECHO], [PROTOCOL_POTATO], security_protocol
-        )
+    stream = await hosts[0].new_stream(hosts[1].get_id(), protocols_for_client)
+    for message, expected_resp in zip(MESSAGES, EXPECTED_RESPONSES):
+        await stream.write(message)
+        assert await stream.read(len(expected_resp)) == expected_resp
+
+    assert expected_selected_protocol == stream.get_protocol()
 
 
 @pytest.mark.trio
-async def test_multiple_protocol_first_is_valid_succeeds(security_protocol):
-    expected_selected_protocol = PROTOCOL_ECHO
-    protocols_for_client = [PROTOCOL_ECHO, PROTOCOL_POTATO]
-    protocols_for_listener = [PROTOCOL_FOO, PROTOCOL_ECHO]
+@pytest.mark.parametrize(
+    "expected_selected_protocol, protocols_for_client, protocols_for_listener",
+    [
+        (PROTOCOL_ECHO, [PROTOCOL_ECHO], [PROTOCOL_ECHO]),
+        (
+            PROTOCOL_ECHO,
+            [PROTOCOL_ECHO, PROTOCOL_POTATO],
+            [PROTOCOL_FOO, PROTOCOL_ECHO],
+        ),
+        (PROTOCOL_FOO, [PROTOCOL_ROCK, PROTOCOL_FOO], [PROTOCOL_FOO, PROTOCOL_ECHO]),
+    ],
+    ids=[
+        "single_protocol",
+        "multiple_protocol_first_is_valid",
+        "multiple_protocol_second_is_valid",
+    ],
+)
+async def test_muxer_success(
+    hosts_pair,
+    expected_selected_protocol,
+    protocols_for_client,
+    protocols_for_listener,
+):
     await perform_simple_test(
+        hosts_pair,
         expected_selected_protocol,
         protocols_for_client,
         protocols_for_listener,
-        security_protocol,
     )
 
 
 @pytest.mark.trio
-async def test_multiple_protocol_second_is_valid_succeeds(security_protocol):
-    expected_selected_protocol = PROTOCOL_FOO
-    protocols_for_client = [PROTOCOL_ROCK, PROTOCOL_FOO]
-    protocols_for_listener = [PROTOCOL_FOO, PROTOCOL_ECHO]
-    await perform_simple_test(
-        expected_selected_protocol,
-        protocols_for_client,
-        protocols_for_listener,
-        security_protocol,
-    )
+async def test_single_protocol_fails(security_protocol):
+    # Expect that protocol negotiation fails when no common protocols exist
+    with pytest.raises(Exception):
+        async with connected_hosts(security_protocol) as hosts:
+            await perform_simple_test(hosts, "", [PROTOCOL_ECHO], [PROTOCOL_POTATO])
 
 
 @pytest.mark.trio
@@ -104,41 +109,33 @@ async def test_multiple_protocol_fails(security_protocol):
 
     # Expect that protocol negotiation fails when no common protocols exist
     with pytest.raises(Exception):
-        await perform_simple_test(
-            "", protocols_for_client, protocols_for_listener, security_protocol
-        )
+        async with connected_hosts(security_protocol) as hosts:
+            await perform_simple_test(
+                hosts, "", protocols_for_client, protocols_for_listener
+            )
 
 
 @pytest.mark.trio
-async def test_multistream_command(security_protocol):
+async def test_multistream_command(hosts_pair):
     supported_protocols = [PROTOCOL_ECHO, PROTOCOL_FOO, PROTOCOL_POTATO, PROTOCOL_ROCK]
+    listener, dialer = hosts_pair[1], hosts_pair[0]
 
-    async with HostFactory.create_batch_and_listen(
-        2, security_protocol=security_protocol
-    ) as hosts:
-        listener, dialer = hosts[1], hosts[0]
+    for protocol in supported_protocols:
+        listener.set_stream_handler(protocol, create_echo_stream_handler(ACK_PREFIX))
 
-        for protocol in supported_protocols:
-            listener.set_stream_handler(
-                protocol, create_echo_stream_handler(ACK_PREFIX)
-            )
-
-        # Ensure dialer knows how to reach the listener
-        dialer.get_peerstore().add_addrs(listener.get_id(), listener.get_addrs(), 10)
-
-        # Dialer asks peer to list the supported protocols using `ls`
-        response = await dialer.send_command(listener.get_id(), "ls")
+    # Dialer asks peer to list the supported protocols using `ls`
+    response = await dialer.send_command(listener.get_id(), "ls")
 
-        # We expect all supported protocols to show up
-        for protocol in supported_protocols:
-            assert protocol in response
+    # We expect all supported protocols to show up
+    for protocol in supported_protocols:
+        assert protocol in response
 
-        assert TProtocol("/does/not/exist") not in response
-        assert TProtocol("/foo/bar/1.2.3") not in response
+    assert TProtocol("/does/not/exist") not in response
+    assert TProtocol("/foo/bar/1.2.3") not in response
 
-        # Dialer asks for unspoorted command
-        with pytest.raises(ValueError, match="Command not supported"):
-            await dialer.send_command(listener.get_id(), "random")
+    # Dialer asks for unspoorted command
+    with pytest.raises(ValueError, match="Command not supported"):
+        await dialer.send_command(listener.get_id(), "random")
 
 
 @pytest.mark.trio
@@ -164,12 +161,8 @@ async def test_get_protocols_returns_all_registered_protocols():
 @pytest.mark.trio
 async def test_negotiate_optional_tprotocol(security_protocol):
     with pytest.raises(Exception):
-        await perform_simple_test(
-            None,
-            [None],
-            [None],
-            security_protocol,
-        )
+        async with connected_hosts(security_protocol) as hosts:
+            await perform_simple_test(hosts, None, [None], [None])
 
 
 @pytest.mark.trio
@@ -177,23 +170,23 @@ async def test_negotiate_optional_tprotocol_client_none_server_no_none(
     security_protocol,
 ):
     with pytest.raises(Exception):
-        await perform_simple_test(None, [None], [PROTOCOL_ECHO], security_protocol)
+        async with connected_hosts(security_protocol) as hosts:
+            await perform_simple_test(hosts, None, [None], [PROTOCOL_ECHO])
 
 
 @pytest.mark.trio
-async def test_negotiate_optional_tprotocol_client_none_in_list(security_protocol):
+async def test_negotiate_optional_tprotocol_client_none_in_list(hosts_pair):
     expected_selected_protocol = PROTOCOL_ECHO
     await perform_simple_test(
+        hosts_pair,
         expected_selected_protocol,
         [None, PROTOCOL_ECHO],
         [PROTOCOL_ECHO],
-        security_protocol,
     )
 
 
 @pytest.mark.trio
-async def test_negotiate_optional_tprotocol_server_none_client_other(
-    security_protocol,
-):
+async def test_negotiate_optional_tprotocol_server_none_client_other(security_protocol):
     with pytest.raises(Exception):
-        await perform_simple_test(None, [PROTOCOL_ECHO], [None], security_protocol)
+        async with connected_hosts(security_protocol) as hosts:
+            await perform_simple_test(hosts, None, [PROTOCOL_ECHO], [None])
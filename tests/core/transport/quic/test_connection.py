@@ -355,6 +355,21 @@ class TestQUICConnection:
             await quic_connection._handle_connection_error(error)
             mock_close.assert_called_once()
 
+    @pytest.mark.trio
+    async def test_client_receiver_uses_single_buffer(self, quic_connection) -> None:
+        """Test dialed connections don't allocate the listener's receive ring."""
+        quic_connection._socket = Mock()
+
+        with patch(
+            "libp2p.transport.quic.connection.DatagramReceiver"
+        ) as mock_receiver:
+            mock_receiver.return_value.receive = AsyncMock(
+                side_effect=trio.ClosedResourceError
+            )
+            await quic_connection._client_packet_receiver()
+
+        assert mock_receiver.call_args.kwargs["batch_size"] == 1
+
     # Statistics and monitoring tests
 
     @pytest.mark.trio
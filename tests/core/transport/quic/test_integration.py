@@ -331,6 +331,54 @@ class TestBasicQUICFlow:
 
         print("✅ TIMEOUT TEST PASSED!")
 
+    @pytest.mark.trio
+    async def test_server_handler_runs_once_per_connection(
+        self, server_key, client_key, server_config, client_config
+    ):
+        """Test the listener invokes its handler exactly once per connection."""
+        server_transport = QUICTransport(server_key.private_key, server_config)
+        handled: list[QUICConnection] = []
+
+        async def long_lived_handler(connection: QUICConnection) -> None:
+            # Like the swarm's handler, stay running for the connection lifetime
+            handled.append(connection)
+            await trio.sleep_forever()
+
+        listener = server_transport.create_listener(long_lived_handler)
+        listen_addr = create_quic_multiaddr("127.0.0.1", 0, "/quic")
+
+        try:
+            async with trio.open_nursery() as nursery:
+                server_transport.set_background_nursery(nursery)
+                assert await listener.listen(listen_addr, nursery)
+
+                server_addr = multiaddr.Multiaddr(
+                    f"{listener.get_addrs()[0]}/p2p/{ID.from_pubkey(server_key.public_key)}"
+                )
+
+                async with trio.open_nursery() as client_nursery:
+                    client_transport = QUICTransport(
+                        client_key.private_key, client_config
+                    )
+                    client_transport.set_background_nursery(client_nursery)
+                    try:
+                        connection = await client_transport.dial(server_addr)
+                        # Let any duplicate promotion of the handshake play out
+                        await trio.sleep(0.5)
+                        await connection.close()
+                    finally:
+                        await client_transport.close()
+                    # Stop the client's periodic background tasks
+                    client_nursery.cancel_scope.cancel()
+
+                nursery.cancel_scope.cancel()
+        finally:
+            await listener.close()
+            await server_transport.close()
+
+        assert len(handled) == 1
+        assert listener.get_stats()["connections_accepted"] == 1
+
 
 @pytest.mark.trio
 async def test_yamux_stress_ping():
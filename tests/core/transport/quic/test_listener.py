@@ -1,6 +1,10 @@
-from unittest.mock import AsyncMock
+import time
+from unittest.mock import AsyncMock, Mock
 
 import pytest
+from aioquic.quic.configuration import QuicConfiguration
+from aioquic.quic.connection import QuicConnection
+from aioquic.quic.packet import QuicPacketType
 from multiaddr.multiaddr import Multiaddr
 import trio
 
@@ -10,7 +14,7 @@ from libp2p.crypto.ed25519 import (
 from libp2p.transport.quic.exceptions import (
     QUICListenError,
 )
-from libp2p.transport.quic.listener import QUICListener
+from libp2p.transport.quic.listener import ConnEntry, QUICListener
 from libp2p.transport.quic.transport import (
     QUICTransport,
     QUICTransportConfig,
@@ -148,3 +152,238 @@ class TestQUICListener:
         assert initial_stats["connections_rejected"] == 0
         assert initial_stats["bytes_received"] == 0
         assert initial_stats["packets_processed"] == 0
+
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            # Sample encodings from RFC 9000, Appendix A.1
+            (bytes.fromhex("c2197c5eff14e88c"), (151288809941952652, 8)),
+            (bytes.fromhex("9d7f3e7d"), (494878333, 4)),
+            (bytes.fromhex("7bbd"), (15293, 2)),
+            (bytes.fromhex("25"), (37, 1)),
+            (bytes.fromhex("4025"), (37, 2)),
+            # Trailing bytes are ignored
+            (bytes.fromhex("25ffff"), (37, 1)),
+            # Truncated input
+            (b"", (0, 0)),
+            (bytes.fromhex("9d7f"), (0, 0)),
+        ],
+    )
+    def test_decode_varint(self, listener: QUICListener, data, expected):
+        """Test QUIC variable-length integer decoding."""
+        assert listener._decode_varint(data) == expected
+
+    @pytest.mark.trio
+    async def test_send_version_negotiation(self, listener: QUICListener):
+        """Test version negotiation packet layout."""
+        listener._socket = AsyncMock()
+        source_cid = bytes.fromhex("0102030405060708")
+
+        await listener._send_version_negotiation(("127.0.0.1", 4001), source_cid)
+
+        packet, addr = listener._socket.sendto.call_args.args
+        assert addr == ("127.0.0.1", 4001)
+        assert packet[0] == 0xF0
+        assert packet[1:5] == b"\x00\x00\x00\x00"
+        assert packet[5] == len(source_cid)
+        assert packet[6 : 6 + len(source_cid)] == source_cid
+        assert packet[6 + len(source_cid)] == 0
+
+        versions = packet[7 + len(source_cid) :]
+        assert len(versions) == 4 * len(listener._supported_versions)
+        assert [
+            int.from_bytes(versions[i : i + 4], "big")
+            for i in range(0, len(versions), 4)
+        ] == sorted(listener._supported_versions)
+        assert listener.get_stats()["version_negotiations"] == 1
+
+    def test_wire_version_config_lookup(self, listener: QUICListener):
+        """Test every supported wire version maps to a QUIC configuration."""
+        assert set(listener._wire_version_to_config) == listener._supported_versions
+        for config in listener._wire_version_to_config.values():
+            assert config in listener._quic_configs.values()
+
+    @pytest.mark.trio
+    async def test_connection_table_tracking(self, listener: QUICListener):
+        """Test pending/established bookkeeping in the connection table."""
+        addr = ("127.0.0.1", 4001)
+        dest_cid = bytes.fromhex("0102030405060708")
+        connection = AsyncMock()
+
+        entry = ConnEntry(dest_cid, addr, AsyncMock())
+        listener._track_entry(dest_cid, entry)
+        listener._addr_to_cid[addr] = dest_cid
+        assert entry.cid_hex == dest_cid.hex()
+
+        stats = listener.get_stats()
+        assert stats["pending_connections"] == 1
+        assert stats["active_connections"] == 0
+
+        listener._mark_established(entry, connection)
+        assert entry.state == ConnEntry.STATE_ESTABLISHED
+
+        stats = listener.get_stats()
+        assert stats["pending_connections"] == 0
+        assert stats["active_connections"] == 1
+
+        await listener._remove_connection(dest_cid)
+        stats = listener.get_stats()
+        assert stats["pending_connections"] == 0
+        assert stats["active_connections"] == 0
+
+        assert dest_cid not in listener._conns
+        assert addr not in listener._addr_to_cid
+        connection.close.assert_awaited_once()
+
+    def test_parse_long_header_packet(self, listener: QUICListener):
+        """Test long header parsing of connection IDs, version and token."""
+        dest_cid = bytes.fromhex("8394c8f03e515708")
+        src_cid = bytes.fromhex("f067a5502a4262b5")
+        token = b"retry-token"
+        initial = (
+            bytes([0xC3])
+            + (1).to_bytes(4, "big")
+            + bytes([len(dest_cid)])
+            + dest_cid
+            + bytes([len(src_cid)])
+            + src_cid
+            + bytes([len(token)])
+            + token
+            + bytes(32)
+        )
+
+        info = listener.parse_quic_packet(initial)
+        assert info is not None
+        assert info.version == 1
+        assert info.destination_cid == dest_cid
+        assert info.source_cid == src_cid
+        assert info.packet_type == QuicPacketType.INITIAL
+        assert info.token == token
+
+        handshake = bytes([0xE3]) + initial[1:]
+        info = listener.parse_quic_packet(handshake)
+        assert info is not None
+        assert info.packet_type == QuicPacketType.HANDSHAKE
+        assert info.token == b""
+
+        # Parsing straight from a receive buffer yields standalone bytes
+        info = listener.parse_quic_packet(memoryview(bytearray(initial)))
+        assert info is not None
+        assert type(info.destination_cid) is bytes
+        assert info.destination_cid == dest_cid
+        assert info.source_cid == src_cid
+        assert info.token == token
+
+        # Truncated inside the connection IDs
+        assert listener.parse_quic_packet(initial[:6]) is None
+        assert listener.parse_quic_packet(initial[:14]) is None
+        assert listener.parse_quic_packet(initial[:20]) is None
+        assert listener.parse_quic_packet(b"") is None
+
+    def test_parse_short_header_packet(self, listener: QUICListener):
+        """Test short header packets resolve to the 8-byte destination CID."""
+        dest_cid = bytes.fromhex("0102030405060708")
+
+        info = listener.parse_quic_packet(bytes([0x40]) + dest_cid + bytes(16))
+        assert info is not None
+        assert info.destination_cid == dest_cid
+        assert info.packet_type == QuicPacketType.ONE_RTT
+
+        assert listener.parse_quic_packet(bytes([0x40]) + dest_cid[:4]) is None
+
+    @pytest.mark.trio
+    async def test_short_header_fast_path(self, listener: QUICListener):
+        """Test short header packets go straight to established connections."""
+        addr = ("127.0.0.1", 4001)
+        dest_cid = bytes.fromhex("0102030405060708")
+        entry = ConnEntry(dest_cid, addr, AsyncMock())
+        entry.connection = AsyncMock()
+        entry.state = ConnEntry.STATE_ESTABLISHED
+        listener._conns[dest_cid] = entry
+        listener._addr_to_cid[addr] = dest_cid
+        listener._route_to_connection = AsyncMock()
+        listener.parse_quic_packet = Mock(return_value=None)
+
+        # Routed by the destination CID in the header
+        packet = bytes([0x40]) + dest_cid + bytes(16)
+        await listener._process_packet(packet, addr)
+        call = listener._route_to_connection.await_args
+        assert call is not None
+        assert call.args[:3] == (
+            entry.connection,
+            packet,
+            addr,
+        )
+
+        # Unknown CID from a known address falls back to the address mapping
+        packet = bytes([0x40]) + bytes(8) + bytes(16)
+        await listener._process_packet(packet, addr)
+        assert listener._route_to_connection.await_count == 2
+
+        listener.parse_quic_packet.assert_not_called()
+
+    @pytest.mark.trio
+    async def test_slow_path_packets_reach_workers(self, listener: QUICListener):
+        """Test packets for unknown connections are queued to the worker pool."""
+        processed = trio.Event()
+        received = []
+
+        async def record_packet(data, addr):
+            received.append(data)
+            processed.set()
+
+        listener._process_packet = record_packet
+        listen_addr = create_quic_multiaddr("127.0.0.1", 0, "/quic")
+
+        async with trio.open_nursery() as nursery:
+            await listener.listen(listen_addr, nursery)
+            assert listener._socket is not None
+            host, port = listener._socket.getsockname()
+
+            packet = bytes([0xC0]) + bytes(31)
+            with trio.socket.socket(type=trio.socket.SOCK_DGRAM) as sender:
+                await sender.sendto(packet, (host, port))
+                with trio.fail_after(5):
+                    await processed.wait()
+
+            await listener.close()
+
+        assert received == [packet]
+
+    @pytest.mark.trio
+    async def test_queued_packets_dropped_after_close(self, listener: QUICListener):
+        """Test workers stop processing packets still queued at close."""
+        listener._process_packet = AsyncMock()
+        for i in range(5):
+            listener._packet_send.send_nowait((bytes([0xC0]) + bytes(31), (f"{i}", 1)))
+
+        await listener.close()
+        with trio.fail_after(5):
+            await listener._packet_worker(listener._packet_receive)
+
+        listener._process_packet.assert_not_awaited()
+        assert not listener._conns
+
+    @pytest.mark.trio
+    async def test_close_during_handshake(self, listener: QUICListener):
+        """Test a handshake in flight at close doesn't register its connection."""
+        client = QuicConnection(
+            configuration=QuicConfiguration(is_client=True, alpn_protocols=["libp2p"])
+        )
+        client.connect(("127.0.0.1", 4001), now=time.time())
+        (initial, _), *_ = client.datagrams_to_send(now=time.time())
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(listener._process_packet, initial, ("127.0.0.1", 4002))
+            await trio.sleep(0)
+            await listener.close()
+
+        assert not listener._conns
+        assert listener.get_stats()["pending_connections"] == 0
+
+    def test_fresh_cid_pool(self, listener: QUICListener):
+        """Test pooled connection IDs are 8 bytes and unique across refills."""
+        cids = [listener._fresh_cid() for _ in range(600)]
+
+        assert all(len(cid) == 8 for cid in cids)
+        assert len(set(cids)) == len(cids)
@@ -0,0 +1,261 @@
+import errno
+import socket
+
+import pytest
+import trio
+
+from libp2p.transport.quic import udp
+from libp2p.transport.quic.udp import send_datagrams
+
+
+async def _bound_pair(family: int, host: str):
+    """Create a sender/receiver pair of bound trio UDP sockets."""
+    sender = trio.socket.socket(family=family, type=socket.SOCK_DGRAM)
+    receiver = trio.socket.socket(family=family, type=socket.SOCK_DGRAM)
+    await sender.bind((host, 0))
+    await receiver.bind((host, 0))
+    return sender, receiver
+
+
+async def _receive(sock, count: int) -> list[bytes]:
+    received = []
+    with trio.fail_after(5):
+        for _ in range(count):
+            data, _ = await sock.recvfrom(65536)
+            received.append(data)
+    return received
+
+
+@pytest.mark.trio
+@pytest.mark.parametrize("count", [1, 3, 16])
+async def test_send_datagrams_burst(count):
+    """Test a burst of datagrams arrives complete and in order."""
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        payloads = [bytes([i]) * (100 + i) for i in range(count)]
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        assert await _receive(receiver, count) == payloads
+
+
+@pytest.mark.trio
+async def test_send_datagrams_ipv6():
+    """Test batched send on an IPv6 socket."""
+    if not socket.has_ipv6:
+        pytest.skip("IPv6 not available")
+    try:
+        sender, receiver = await _bound_pair(socket.AF_INET6, "::1")
+    except OSError:
+        pytest.skip("IPv6 loopback not available")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        payloads = [b"first", b"second"]
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        assert await _receive(receiver, 2) == payloads
+
+
+@pytest.mark.trio
+async def test_send_datagrams_without_sendmmsg(monkeypatch):
+    """Test the per-datagram fallback used on platforms without sendmmsg."""
+    monkeypatch.setattr(udp, "_sendmmsg", None)
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        payloads = [b"a", b"bb", b"ccc"]
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        assert await _receive(receiver, 3) == payloads
+
+
+@pytest.mark.trio
+async def test_send_datagrams_hostname_falls_back():
+    """Test destinations that need name resolution are sent with sendto."""
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        _, port = receiver.getsockname()
+        payloads = [b"one", b"two"]
+
+        await send_datagrams(
+            sender, [(payload, ("localhost", port)) for payload in payloads]
+        )
+
+        assert await _receive(receiver, 2) == payloads
+
+
+@pytest.mark.trio
+async def test_send_datagrams_gso_burst():
+    """Test an equal-sized burst with a short tail is segmented on receipt."""
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        # Spans more than one GSO send, and ends with a shorter datagram
+        payloads = [bytes([i]) * 1200 for i in range(60)] + [b"tail"]
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        assert await _receive(receiver, len(payloads)) == payloads
+
+
+def test_gso_batches_rejects_mixed_bursts():
+    """Test bursts GSO can't express are left to the other send paths."""
+    addr = ("127.0.0.1", 4001)
+    other = ("127.0.0.1", 4002)
+
+    assert udp._gso_batches([(b"aa", addr), (b"a", addr), (b"aa", addr)]) is None
+    assert udp._gso_batches([(b"a", addr), (b"aa", addr)]) is None
+    assert udp._gso_batches([(b"aa", addr), (b"aa", other)]) is None
+    assert udp._gso_batches([(b"aa", addr), (b"a", addr)]) == [(0, 2, b"aaa")]
+
+
+@pytest.mark.trio
+async def test_send_datagrams_gso_rejected(monkeypatch):
+    """Test a burst is still delivered when the kernel rejects GSO."""
+    monkeypatch.setattr(udp, "_gso_enabled", True)
+
+    async def reject_gso(self, *args, **kwargs):
+        raise OSError(errno.EIO, "GSO not supported")
+
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    monkeypatch.setattr(type(sender), "sendmsg", reject_gso)
+    with sender, receiver:
+        addr = receiver.getsockname()
+        payloads = [b"x" * 100, b"y" * 100, b"z" * 100]
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        assert await _receive(receiver, 3) == payloads
+        assert udp._gso_enabled is False
+
+
+async def _receive_batched(receiver: udp.DatagramReceiver, count: int):
+    received = []
+    with trio.fail_after(5):
+        while len(received) < count:
+            received.extend(await receiver.receive())
+    return received
+
+
+@pytest.mark.trio
+async def test_datagram_receiver_drains_burst():
+    """Test a queued burst is dequeued in order with recvfrom-style addresses."""
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        payloads = [bytes([i]) * (50 + i) for i in range(10)]
+        for payload in payloads:
+            await sender.sendto(payload, receiver.getsockname())
+
+        received = await _receive_batched(udp.DatagramReceiver(receiver), 10)
+
+        assert [data for data, _ in received] == payloads
+        assert {addr for _, addr in received} == {sender.getsockname()}
+
+
+@pytest.mark.trio
+async def test_datagram_receiver_ipv6():
+    """Test IPv6 peer addresses are decoded like recvfrom returns them."""
+    if not socket.has_ipv6:
+        pytest.skip("IPv6 not available")
+    try:
+        sender, receiver = await _bound_pair(socket.AF_INET6, "::1")
+    except OSError:
+        pytest.skip("IPv6 loopback not available")
+    with sender, receiver:
+        await sender.sendto(b"v6", receiver.getsockname())
+
+        received = await _receive_batched(udp.DatagramReceiver(receiver), 1)
+
+        assert received == [(b"v6", sender.getsockname())]
+
+
+@pytest.mark.trio
+async def test_datagram_receiver_drops_oversized():
+    """Test datagrams larger than the receive buffers are dropped."""
+    if udp._recvmmsg is None:
+        pytest.skip("recvmmsg not available")
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        await sender.sendto(b"x" * 100, addr)
+        await sender.sendto(b"small", addr)
+
+        batch_receiver = udp.DatagramReceiver(receiver, buffer_size=64)
+        received = await _receive_batched(batch_receiver, 1)
+
+        assert [data for data, _ in received] == [b"small"]
+
+
+@pytest.mark.trio
+async def test_datagram_receiver_accepts_jumbo_datagrams():
+    """Test the default buffers fit datagrams well beyond the QUIC minimum."""
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        payload = b"j" * 9000
+        await sender.sendto(payload, receiver.getsockname())
+
+        received = await _receive_batched(udp.DatagramReceiver(receiver), 1)
+
+        assert [data for data, _ in received] == [payload]
+
+
+@pytest.mark.trio
+async def test_datagram_receiver_without_recvmmsg(monkeypatch):
+    """Test the one-datagram-per-call fallback."""
+    monkeypatch.setattr(udp, "_recvmmsg", None)
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        payloads = [b"a", b"bb"]
+        for payload in payloads:
+            await sender.sendto(payload, receiver.getsockname())
+
+        received = await _receive_batched(udp.DatagramReceiver(receiver), 2)
+
+        assert [data for data, _ in received] == payloads
+
+
+@pytest.mark.trio
+async def test_set_socket_buffer_sizes():
+    """Test buffer sizes are applied, and None leaves the OS default."""
+    with trio.socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM) as sock:
+        default_send = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+
+        udp.set_socket_buffer_sizes(sock, 8192, None)
+
+        # Linux doubles the requested size for bookkeeping overhead
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) in (8192, 16384)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) == default_send
+
+
+@pytest.mark.trio
+@pytest.mark.parametrize("batched", [True, False])
+async def test_datagram_receiver_gro(monkeypatch, batched):
+    """Test coalesced receives are split back into the datagrams sent."""
+    if not batched:
+        monkeypatch.setattr(udp, "_recvmmsg", None)
+    sender, receiver = await _bound_pair(socket.AF_INET, "127.0.0.1")
+    with sender, receiver:
+        addr = receiver.getsockname()
+        payloads = [bytes([i]) * 1200 for i in range(20)] + [b"tail"]
+        batch_receiver = udp.DatagramReceiver(receiver, gro=True)
+
+        await send_datagrams(sender, [(payload, addr) for payload in payloads])
+
+        received = await _receive_batched(batch_receiver, len(payloads))
+        assert [data for data, _ in received] == payloads
+
+
+def test_split_segments():
+    """Test GRO buffers split on the segment size, with a short tail."""
+    addr = ("127.0.0.1", 4001)
+
+    assert udp._split_segments(b"aabbc", addr, 2) == [
+        (b"aa", addr),
+        (b"bb", addr),
+        (b"c", addr),
+    ]
+    assert udp._split_segments(b"aabbc", addr, None) == [(b"aabbc", addr)]
+    assert udp._split_segments(b"aa", addr, 2) == [(b"aa", addr)]
@@ -17,6 +17,7 @@ from libp2p.transport.quic.utils import (
     is_quic_multiaddr,
     multiaddr_to_quic_version,
     normalize_quic_multiaddr,
+    parse_quic_multiaddr,
     quic_multiaddr_to_endpoint,
     quic_version_to_wire_format,
 )
@@ -142,6 +143,45 @@ class TestMultiaddrToQuicVersion:
             multiaddr_to_quic_version(maddr)
 
 
+class TestParseQuicMultiaddr:
+    """Test single-pass QUIC multiaddr parsing."""
+
+    def test_agrees_with_individual_helpers(self):
+        """Test host, port and version match the dedicated helpers."""
+        addrs = [
+            "/ip4/127.0.0.1/udp/4001/quic-v1",
+            "/ip4/192.168.1.100/udp/8080/quic",
+            "/ip6/::1/udp/4001/quic-v1",
+            "/ip6/2001:db8::1/udp/5000/quic",
+        ]
+
+        for addr_str in addrs:
+            maddr = Multiaddr(addr_str)
+            host, port, version = parse_quic_multiaddr(maddr)
+            assert (host, port) == quic_multiaddr_to_endpoint(maddr)
+            assert version == multiaddr_to_quic_version(maddr)
+
+    def test_ignores_trailing_peer_id(self):
+        """Test a trailing /p2p component doesn't affect parsing."""
+        maddr = Multiaddr(
+            "/ip4/127.0.0.1/udp/4001/quic-v1"
+            "/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN"
+        )
+        assert parse_quic_multiaddr(maddr) == ("127.0.0.1", 4001, "quic-v1")
+
+    def test_invalid_multiaddr_raises_error(self):
+        """Test non-QUIC multiaddrs raise appropriate errors."""
+        invalid_addrs = [
+            "/ip4/127.0.0.1/tcp/4001",
+            "/ip4/127.0.0.1/udp/4001",
+            "/udp/4001/quic-v1",
+        ]
+
+        for addr_str in invalid_addrs:
+            with pytest.raises(QUICInvalidMultiaddrError):
+                parse_quic_multiaddr(Multiaddr(addr_str))
+
+
 class TestCreateQuicMultiaddr:
     """Test QUIC multiaddr creation."""
 